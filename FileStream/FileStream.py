@@ -1,4 +1,3 @@
-import codecs
 from FileStream.InputStream import InputStream
 
 
@@ -11,7 +10,6 @@ class FileStream(InputStream):
 
     @staticmethod
     def _read_data_from(fileName: str, encoding: str, errors: str) -> str:
-        # read binary to avoid line ending conversion
-        with open(fileName, 'rb') as f:
-            b = f.read()
-            return codecs.decode(b, encoding, errors)
+        # newline='' to avoid line ending conversion
+        with open(fileName, 'r', encoding=encoding, errors=errors, newline='') as f:
+            return f.read()
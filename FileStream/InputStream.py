@@ -2,7 +2,7 @@ from Token import Token
 
 
 class InputStream(object):
-    __slots__ = ('name', 'strdata', '_index', 'data', '_size')
+    __slots__ = ('name', 'strdata', '_index', 'data', '_size', '_ords')
 
     def __init__(self, data: str):
         self.name: str = "<empty>"
@@ -13,6 +13,8 @@ class InputStream(object):
     def _load_string(self):
         self._index = 0
         self._size = len(self.strdata)
+        # code points for LA(), built on first use
+        self._ords = None
 
     @property
     def index(self) -> int:
@@ -34,12 +36,13 @@ class InputStream(object):
     def LA(self, offset: int) -> int:
         if offset == 0:
             return 0
-        if offset < 0:
-            offset += 1
-        pos = self._index + offset - 1
+        pos = self._index + (offset if offset > 0 else offset + 1) - 1
         if pos < 0 or pos >= self._size:
             return Token.EOF
-        return ord(self.strdata[pos])
+        ords = self._ords
+        if ords is None:
+            ords = self._ords = list(map(ord, self.strdata))
+        return ords[pos]
 
     def LT(self, offset: int) -> int:
         return self.LA(offset)
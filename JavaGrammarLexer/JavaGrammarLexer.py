@@ -1,7 +1,29 @@
 import re
+import sys
 from JavaGrammarLexer.Lexer import Lexer
 from Token import Token
 
+
+def _grouped_alternation(words) -> str:
+    """
+    Альтернация слов, сгруппированная по первому символу:
+    ['>>>=', '>>=', '>=', '>'] -> '>(?:>>=|>=)?'.
+    Внутри группы хвосты идут от длинных к коротким, поэтому побеждает самое длинное слово.
+    """
+    groups = {}
+    for w in sorted(words, key=len, reverse=True):
+        groups.setdefault(w[0], []).append(w[1:])
+    alts = []
+    for first, tails in groups.items():
+        optional = '' in tails
+        tails = [re.escape(t) for t in tails if t]
+        alt = re.escape(first)
+        if tails:
+            alt += '(?:' + '|'.join(tails) + ')' + ('?' if optional else '')
+        alts.append(alt)
+    return '|'.join(alts)
+
+
 class JavaGrammarLexer(Lexer):
 
     KEYWORDS = {
@@ -39,6 +61,54 @@ class JavaGrammarLexer(Lexer):
         '/': 'DIV', '&': 'BITAND', '|': 'BITOR', '^': 'CARET', '%': 'MOD', '@': 'AT'
     }
 
+    # длины ключевых слов: идентификатор другой длины не ищем в KEYWORDS
+    KEYWORD_LENGTHS = frozenset(map(len, KEYWORDS))
+
+    # классы символов для быстрых проверок без regex
+    WS_CHARS = frozenset(' \t\r\n')
+    ID_START = frozenset('ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz_')
+    ID_PART = ID_START | frozenset('0123456789')
+
+    # Регулярки отдельных видов лексем, компилируются один раз при загрузке класса.
+    # символы: группируем по первому символу, длинные в приоритете
+    COMMENT_PATTERN = r'//[^\n]*|/\*[\s\S]*?\*/'
+    STRING_PATTERN = r'"(?:\\.|[^"\\])*"'
+    CHAR_PATTERN = r"'(?:\\.|[^'\\])'"
+    NUMBER_PATTERN = r'\d+(?:\.\d+)?(?:[eE][+-]?\d+)?'
+    SYMBOL_PATTERN = _grouped_alternation(SYMBOLS_MAP)
+
+    # Одна общая регулярка с именованными группами.
+    # Пробелы и идентификаторы распознаются раньше посимвольно (WS_CHARS / ID_START),
+    # порядок остальных альтернатив = порядок проверки:
+    # комментарии -> строки/char -> числа -> символы
+    # (всё, что не совпало ни с одной альтернативой, — UNKNOWN)
+    MASTER_RE = re.compile(
+        f'(?P<COMMENT>{COMMENT_PATTERN})|(?P<STRING>{STRING_PATTERN})|(?P<CHAR>{CHAR_PATTERN})'
+        f'|(?P<NUMBER>{NUMBER_PATTERN})|(?P<SYMBOL>{SYMBOL_PATTERN})'
+    )
+
+    # По первому символу вид лексемы почти всегда однозначен — тогда сразу пробуем
+    # только её регулярку. '/' (комментарий или деление) и прочие символы идут через MASTER_RE.
+    FIRST_CHAR_RE = {
+        **dict.fromkeys({s[0] for s in SYMBOLS_MAP} - {'/'}, ('SYMBOL', re.compile(SYMBOL_PATTERN))),
+        **dict.fromkeys('0123456789', ('NUMBER', re.compile(NUMBER_PATTERN))),
+        '"': ('STRING', re.compile(STRING_PATTERN)),
+        "'": ('CHAR', re.compile(CHAR_PATTERN)),
+    }
+
+    # Полная регулярка для потокового разбора через finditer (см. tokens()):
+    # все виды лексем в исходном порядке проверки + UNKNOWN на любой оставшийся символ,
+    # поэтому совпадения идут подряд, без пропусков.
+    SCAN_RE = re.compile(
+        rf'(?P<WS>[ \t\r\n]+)|(?P<COMMENT>{COMMENT_PATTERN})|(?P<STRING>{STRING_PATTERN})|(?P<CHAR>{CHAR_PATTERN})'
+        f'|(?P<NUMBER>{NUMBER_PATTERN})|(?P<IDENTIFIER>[A-Za-z_][A-Za-z0-9_]*)|(?P<SYMBOL>{SYMBOL_PATTERN})'
+        rf'|(?P<UNKNOWN>[\s\S])'
+    )
+    # имена групп SCAN_RE по их номерам: tokens() различает вид лексемы по целому m.lastindex.
+    # Имена из groupindex не интернированы, а они становятся типами токенов STRING/CHAR/NUMBER/UNKNOWN —
+    # интернируем, чтобы сравнения типов в парсере срабатывали на совпадении указателей.
+    SCAN_KINDS = (None,) + tuple(map(sys.intern, sorted(SCAN_RE.groupindex, key=SCAN_RE.groupindex.get)))
+
     def __init__(self, input_stream):
         super().__init__(input_stream)
         # исходный код как строка
@@ -49,124 +119,181 @@ class JavaGrammarLexer(Lexer):
         # синхронизируем индекс базового Lexer (если кто-то его использует)
         self._index = 0
 
-        # Компилируем регулярки один раз
-        # порядок проверки: комментарии -> строки/char -> числа -> идентификатор -> символы -> unknown
-        self._whitespace_re = re.compile(r'[ \t\r\n]+')
-        self._comment_re = re.compile(r'//[^\n]*|/\*[\s\S]*?\*/')
-        self._string_re = re.compile(r'"(?:\\.|[^"\\])*"')
-        self._char_re = re.compile(r"'(?:\\.|[^'\\])'")
-        self._number_re = re.compile(r'\d+(?:\.\d+)?(?:[eE][+-]?\d+)?')
-        self._identifier_re = re.compile(r'[A-Za-z_][A-Za-z0-9_]*')
-
-        # символы: собираем из словаря, сортируем по длине (чтобы длинные в приоритете)
-        sym_keys = sorted(self.SYMBOLS_MAP.keys(), key=lambda x: -len(x))
-        sym_pattern = '|'.join(re.escape(s) for s in sym_keys)
-        self._symbol_re = re.compile(sym_pattern)
-
     def _advance_position(self, text_segment: str):
         """Обновляет self._pos, self._index, self._line и self._column по съеденному тексту."""
         length = len(text_segment)
         self._pos += length
         self._index += length
 
-        if '\n' in text_segment:
+        nl = text_segment.count('\n')
+        if nl:
             # если были переводы строки — увеличим строку и посчитаем новую колонку
-            parts = text_segment.split('\n')
-            self._line += len(parts) - 1
-            self._column = len(parts[-1])
+            self._line += nl
+            self._column = length - text_segment.rfind('\n') - 1
         else:
             self._column += length
 
+    def _advance_to(self, end: int):
+        """То же, что _advance_position, но по индексу конца в self._code — без копирования подстроки."""
+        code = self._code
+        pos = self._pos
+        self._index += end - pos
+        nl = code.count('\n', pos, end)
+        if nl:
+            self._line += nl
+            self._column = end - code.rfind('\n', pos, end) - 1
+        else:
+            self._column += end - pos
+        self._pos = end
+
     def nextToken(self):
-        while True:
-            if self._pos >= self._length:
-                return self.emitEOF()
-
-            text = self._code[self._pos:]
-
-            # 1) Пробелы / переводы строк — пропускаем
-            m = self._whitespace_re.match(text)
-            if m:
-                value = m.group(0)
-                self._advance_position(value)
-                continue  # ищем следующий токен
-
-            # 2) Комментарии (однострочные и многострочные) — помечаем HIDDEN
-            m = self._comment_re.match(text)
-            if m:
-                value = m.group(0)
-                start = self._index
-                stop = start + len(value) - 1
-                tok = self._factory.create(
-                    (self, self._input),
-                    'COMMENT',
-                    value,
-                    Token.HIDDEN_CHANNEL,
-                    start,
-                    stop,
-                    self._line,
-                    self._column
-                )
-                self._advance_position(value)
-                return tok
-
-            # 3) Строковый литерал
-            m = self._string_re.match(text)
-            if m:
-                value = m.group(0)
-                start = self._index
-                stop = start + len(value) - 1
-                tok = self._factory.create((self, self._input), 'STRING', value, Token.DEFAULT_CHANNEL, start, stop, self._line, self._column)
-                self._advance_position(value)
-                return tok
-
-            # 4) Символьный литерал
-            m = self._char_re.match(text)
-            if m:
-                value = m.group(0)
-                start = self._index
-                stop = start + len(value) - 1
-                tok = self._factory.create((self, self._input), 'CHAR', value, Token.DEFAULT_CHANNEL, start, stop, self._line, self._column)
-                self._advance_position(value)
-                return tok
-
-            # 5) Числа (integer / float)
-            m = self._number_re.match(text)
-            if m:
-                value = m.group(0)
-                start = self._index
-                stop = start + len(value) - 1
-                tok = self._factory.create((self, self._input), 'NUMBER', value, Token.DEFAULT_CHANNEL, start, stop, self._line, self._column)
-                self._advance_position(value)
-                return tok
-
-            # 6) Идентификатор / ключевое слово
-            m = self._identifier_re.match(text)
-            if m:
-                value = m.group(0)
-                start = self._index
-                stop = start + len(value) - 1
+        code = self._code
+        n = self._length
+        pos = self._pos
+
+        # Пробелы / переводы строк — пропускаем
+        ws = self.WS_CHARS
+        if pos < n and code[pos] in ws:
+            end = pos + 1
+            while end < n and code[end] in ws:
+                end += 1
+            self._advance_to(end)
+            pos = end
+
+        if pos >= n:
+            return self.emitEOF()
+
+        # Идентификатор / ключевое слово
+        if code[pos] in self.ID_START:
+            part = self.ID_PART
+            end = pos + 1
+            while end < n and code[end] in part:
+                end += 1
+            value = code[pos:end]
+            if end - pos in self.KEYWORD_LENGTHS:
                 token_type = self.KEYWORDS.get(value, 'IDENTIFIER')
-                tok = self._factory.create((self, self._input), token_type, value, Token.DEFAULT_CHANNEL, start, stop, self._line, self._column)
-                self._advance_position(value)
-                return tok
-
-            # 7) Операторы / символы (многосимвольные в приоритете)
-            m = self._symbol_re.match(text)
-            if m:
-                value = m.group(0)
-                start = self._index
-                stop = start + len(value) - 1
-                token_type = self.SYMBOLS_MAP.get(value, 'SYMBOL')
-                tok = self._factory.create((self, self._input), token_type, value, Token.DEFAULT_CHANNEL, start, stop, self._line, self._column)
-                self._advance_position(value)
-                return tok
-
-            # 8) Нераспознанный символ — возвращаем как UNKNOWN
-            #    (чтобы лексер не зацикливался, съедаем 1 символ)
-            value = text[0]
+            else:
+                token_type = 'IDENTIFIER'
             start = self._index
-            stop = start
-            tok = self._factory.create((self, self._input), 'UNKNOWN', value, Token.DEFAULT_CHANNEL, start, stop, self._line, self._column)
-            self._advance_position(value)
+            tok = self._factory.create(self._source, token_type, value, Token.DEFAULT_CHANNEL, start, start + end - pos - 1, self._line, self._column)
+            self._index += end - pos
+            self._column += end - pos
+            self._pos = end
+            return tok
+
+        entry = self.FIRST_CHAR_RE.get(code[pos])
+        if entry is not None:
+            kind, pattern = entry
+            m = pattern.match(code, pos)
+        else:
+            m = self.MASTER_RE.match(code, pos)
+            kind = m.lastgroup if m is not None else None
+
+        # Нераспознанный символ — возвращаем как UNKNOWN
+        # (чтобы лексер не зацикливался, съедаем 1 символ)
+        if m is None:
+            value = code[pos]
+            start = self._index
+            tok = self._factory.create(self._source, 'UNKNOWN', value, Token.DEFAULT_CHANNEL, start, start, self._line, self._column)
+            # перевод строки сюда не попадает (это пробельный символ)
+            self._pos += 1
+            self._index += 1
+            self._column += 1
             return tok
+
+        value = m.group()
+
+        if kind == 'COMMENT':
+            # комментарии (однострочные и многострочные) — помечаем HIDDEN
+            token_type, channel = 'COMMENT', Token.HIDDEN_CHANNEL
+        elif kind == 'SYMBOL':
+            # операторы / символы (многосимвольные в приоритете); группа SYMBOL
+            # собрана из ключей SYMBOLS_MAP, поэтому значение там всегда есть
+            token_type, channel = self.SYMBOLS_MAP[value], Token.DEFAULT_CHANNEL
+        else:
+            # STRING / CHAR / NUMBER
+            token_type, channel = kind, Token.DEFAULT_CHANNEL
+
+        start = self._index
+        length = len(value)
+        tok = self._factory.create(self._source, token_type, value, channel, start, start + length - 1, self._line, self._column)
+        if kind == 'SYMBOL' or kind == 'NUMBER':
+            # в операторах и числах переводов строк не бывает — только сдвиг колонки
+            self._pos += length
+            self._index += length
+            self._column += length
+        else:
+            self._advance_position(value)
+        return tok
+
+    def tokens(self):
+        """
+        Генератор токенов от текущей позиции до EOF (включительно).
+        Весь оставшийся текст проходится одним finditer по SCAN_RE — regex-движок сам
+        двигается по строке, а Python обрабатывает только готовые совпадения.
+        """
+        code = self._code
+        source = self._source
+        create = self._factory.create
+        keywords = self.KEYWORDS
+        keyword_lengths = self.KEYWORD_LENGTHS
+        symbols = self.SYMBOLS_MAP
+        line = self._line
+        line_start = self._pos - self._column  # индекс начала текущей строки
+        kinds = self.SCAN_KINDS
+        intern = sys.intern
+        groups = self.SCAN_RE.groupindex
+        WS, COMMENT, IDENTIFIER, SYMBOL = groups['WS'], groups['COMMENT'], groups['IDENTIFIER'], groups['SYMBOL']
+
+        for m in self.SCAN_RE.finditer(code, self._pos):
+            group = m.lastindex
+            start, end = m.span()
+
+            if group == WS:
+                nl = code.count('\n', start, end)
+                if nl:
+                    line += nl
+                    line_start = code.rfind('\n', start, end) + 1
+                continue
+
+            value = m.group()
+            # переводы строк возможны только в комментариях, строках и char-литералах
+            nl = 0
+            if group == IDENTIFIER:
+                if end - start in keyword_lengths:
+                    token_type = keywords.get(value, 'IDENTIFIER')
+                else:
+                    token_type = 'IDENTIFIER'
+                if token_type == 'IDENTIFIER':
+                    # одно и то же имя встречается многократно — храним одну строку на имя
+                    value = intern(value)
+                channel = Token.DEFAULT_CHANNEL
+            elif group == SYMBOL:
+                token_type, channel = symbols[value], Token.DEFAULT_CHANNEL
+            elif group == COMMENT:
+                token_type, channel = 'COMMENT', Token.HIDDEN_CHANNEL
+                nl = value.count('\n')
+            else:
+                # STRING / CHAR / NUMBER / UNKNOWN
+                token_type, channel = kinds[group], Token.DEFAULT_CHANNEL
+                nl = value.count('\n')
+
+            tok = create(source, token_type, value, channel, start, end - 1, line, start - line_start)
+            if nl:
+                line += nl
+                line_start = start + value.rfind('\n') + 1
+
+            # синхронизируем состояние лексера, чтобы после выхода из генератора
+            # можно было продолжить через nextToken()
+            self._pos = self._index = end
+            self._line = line
+            self._column = end - line_start
+            yield tok
+
+        self._pos = self._index = self._length
+        self._line = line
+        self._column = self._length - line_start
+        yield self.emitEOF()
+
+    def getAllTokens(self):
+        return list(self.tokens())
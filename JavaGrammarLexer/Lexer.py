@@ -11,6 +11,8 @@ class Lexer:
         self._input = input_stream
         self._output = output
         self._factory = CommonTokenFactory.DEFAULT
+        # источник токенов — один и тот же кортеж для всех токенов лексера
+        self._source = (self, input_stream)
 
 
         self._line = 1
@@ -39,7 +41,7 @@ class Lexer:
         start = self._index
         stop = start + len(text) - 1
         token = self._factory.create(
-            (self, self._input),
+            self._source,
             token_type,
             text,
             channel,
@@ -62,7 +64,7 @@ class Lexer:
             return self._token
         self._hitEOF = True
         eof = self._factory.create(
-            (self, self._input),
+            self._source,
             Token.EOF,
             "<EOF>",
             Token.DEFAULT_CHANNEL,
@@ -94,9 +96,12 @@ class Lexer:
     def getAllTokens(self):
 
         tokens = []
+        append = tokens.append
+        next_token = self.nextToken
+        eof = Token.EOF
         while True:
-            tok = self.nextToken()
-            tokens.append(tok)
-            if tok.type == Token.EOF:
+            tok = next_token()
+            append(tok)
+            if tok.type == eof:
                 break
         return tokens
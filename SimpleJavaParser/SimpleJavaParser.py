@@ -2,28 +2,58 @@ from typing import Optional
 from Token import Token
 
 class ASTNode:
+    __slots__ = ('type', 'value', 'children')
+
     def __init__(self, type_, value=None, children=None):
+        # type_ всегда строковый литерал из этого модуля ("Call", "Block", ...) — компилятор
+        # такие строки интернирует, поэтому ключи диспетчеров транслятора совпадают с ним
+        # по указателю; sys.intern на каждом узле не нужен
         self.type = type_
         self.value = value
-        self.children = children or []
+        # у листьев (Literal, Identifier, Break, ...) детей нет — вместо нового пустого
+        # списка на каждый лист делят один пустой кортеж; дети только читаются
+        self.children = () if children is None else children
 
     def __repr__(self, level=0):
-        indent = "  " * level
-        s = f"{indent}{self.type}"
-        if self.value is not None:
-            s += f": {self.value}"
-        for child in self.children:
-            if isinstance(child, ASTNode):
-                s += "\n" + child.__repr__(level + 1)
+        # обход в глубину явным стеком: без рекурсии и без квадратичной склейки строк;
+        # одна строка на узел, склеиваются один раз через "\n".join
+        lines = []
+        append = lines.append
+        stack = [(self, "  " * level)]
+        pop = stack.pop
+        push = stack.append
+        while stack:
+            node, indent = pop()
+            if not isinstance(node, ASTNode):
+                append(indent + repr(node))
+                continue
+            if node.value is None:
+                append(f"{indent}{node.type}")
             else:
-                s += "\n" + ("  " * (level + 1)) + repr(child)
-        return s
+                append(f"{indent}{node.type}: {node.value}")
+            children = node.children
+            if children:
+                indent += "  "  # отступ детей считается один раз на узел
+                for child in reversed(children):
+                    push((child, indent))
+        return "\n".join(lines)
 
 
 class SimpleJavaParser:
-    IGNORED = {"COMMENT", "LINE_COMMENT", "WS"}
-    MODIFIERS = {"PUBLIC", "PRIVATE", "PROTECTED", "STATIC", "FINAL", "ABSTRACT"}
-    TYPE_KEYWORDS = {"INT", "FLOAT", "DOUBLE", "BOOLEAN", "CHAR", "VOID", "STRING"}
+    # фиксированный набор полей: курсор и текущий токен читаются на каждом шаге разбора
+    __slots__ = ('tokens', '_toks', '_types', '_last', '_i', 'current', '_current_class_name',
+                 '_mods_from', '_mods_end')
+
+    IGNORED = frozenset({"COMMENT", "LINE_COMMENT", "WS"})
+    MODIFIERS = frozenset({"PUBLIC", "PRIVATE", "PROTECTED", "STATIC", "FINAL", "ABSTRACT"})
+    TYPE_KEYWORDS = frozenset({"INT", "FLOAT", "DOUBLE", "BOOLEAN", "CHAR", "VOID", "STRING"})
+    RETURN_TYPES = TYPE_KEYWORDS | {"VOID", "IDENTIFIER"}
+    # токены, с которых начинается тип поля/переменной/параметра (VOID уже в TYPE_KEYWORDS)
+    TYPE_START = TYPE_KEYWORDS | {"IDENTIFIER"}
+    # токены, с которых может начинаться объявление типа верхнего уровня
+    TYPE_DECL_START = MODIFIERS | {"CLASS"}
+    # токены, с которых может начинаться член класса (поле, метод, конструктор)
+    MEMBER_START = MODIFIERS | RETURN_TYPES
     PRECEDENCE = {
         "MUL": 60, "DIV": 60, "MOD": 60,
         "ADD": 50, "SUB": 50,
@@ -33,103 +63,156 @@ class SimpleJavaParser:
         "BITAND": 5, "BITOR": 5, "CARET": 5,
         "LSHIFT": 5, "RSHIFT": 5, "URSHIFT": 5,
     }
+    # границы циклов разбора. Token.EOF — число, поэтому кортеж вида ("RBRACE", Token.EOF)
+    # не сворачивается компилятором в константу и проверяется перебором; frozenset — одним хешем
+    BLOCK_END = frozenset({"RBRACE", Token.EOF})
+    PARAMS_END = frozenset({"RPAREN", Token.EOF})
+    SWITCH_SECTION_END = frozenset({"CASE", "DEFAULT", "RBRACE", Token.EOF})
+    # составное присваивание -> бинарный оператор
+    COMPOUND_ASSIGN = {
+        "ADD_ASSIGN": "ADD",
+        "SUB_ASSIGN": "SUB",
+        "MUL_ASSIGN": "MUL",
+        "DIV_ASSIGN": "DIV",
+        "MOD_ASSIGN": "MOD",
+        "AND_ASSIGN": "BITAND",
+        "OR_ASSIGN":  "BITOR",
+        "XOR_ASSIGN": "CARET",
+        "LSHIFT_ASSIGN": "LSHIFT",
+        "RSHIFT_ASSIGN": "RSHIFT",
+        "URSHIFT_ASSIGN": "URSHIFT",
+    }
 
     def __init__(self, tokens):
         self.tokens = tokens
-        self.current = self.tokens.LT(1)
-        self._skip_ignored()
+        # значимые токены (без IGNORED) одним списком, последний — EOF;
+        # дальше парсер двигается по нему целым курсором
+        ignored = self.IGNORED
+        stream = tokens.tokens
+        if tokens.pos:
+            stream = stream[tokens.pos:]
+        self._toks = [t for t in stream if t.type not in ignored]
+        # параллельный список типов (SoA): просмотр вперёд читает типы без обращения
+        # к объектам токенов, а поиск через list.index идёт на уровне C
+        self._types = [t.type for t in self._toks]
+        self._last = len(self._toks) - 1
+        self._i = 0
+        self.current = self._toks[0]
         self._current_class_name: Optional[str] = None
+        # одноэлементный кэш _modifiers_end(): позиция курсора -> индекс первого не-модификатора
+        self._mods_from = -1
+        self._mods_end = 0
 
     # --------------- utilities ---------------
-    def _skip_ignored(self):
-        while self.current is not None and getattr(self.current, "type", None) in self.IGNORED:
-            self.tokens.consume()
-            self.current = self.tokens.LT(1)
-
     def advance(self):
-        self.tokens.consume()
-        self.current = self.tokens.LT(1)
-        self._skip_ignored()
+        # курсор упирается в EOF и дальше не идёт, поэтому self.current никогда не бывает None
+        if self._i < self._last:
+            self._i += 1
+        self.current = self._toks[self._i]
 
     def match(self, expected_type: str):
-        if (self.current is None) or (self.current.type == Token.EOF and expected_type != Token.EOF):
-            raise SyntaxError(f"Ожидался {expected_type}, получен EOF")
-        if self.current.type != expected_type:
-            raise SyntaxError(f"Ожидался {expected_type}, получен {self.current.type}")
-        self.advance()
+        current_type = self.current.type
+        if current_type != expected_type:
+            if current_type == Token.EOF:
+                raise SyntaxError(f"Ожидался {expected_type}, получен EOF")
+            raise SyntaxError(f"Ожидался {expected_type}, получен {current_type}")
+        # тело advance() встроено: match/accept вызываются на каждом разделителе
+        i = self._i
+        if i < self._last:
+            self._i = i = i + 1
+        self.current = self._toks[i]
 
     def accept(self, expected_type: str) -> bool:
-        if self.current is not None and self.current.type == expected_type:
-            self.advance()
+        if self.current.type == expected_type:
+            i = self._i
+            if i < self._last:
+                self._i = i = i + 1
+            self.current = self._toks[i]
             return True
         return False
 
     def peek_type(self, k=1):
-        t = self.tokens.LT(k)
-        return t.type if t is not None else None
-
-    def _peek_token(self, k: int):
-        try:
-            return self.tokens.LT(k)
-        except Exception:
-            return None
-
-    def _peek_text(self, k: int):
-        t = self._peek_token(k)
-        return getattr(t, "text", None) if t is not None else None
+        i = self._i + k - 1
+        return self._types[i if i < self._last else self._last]
 
     def _maybe_generic_suffix(self, base_type: str) -> str:
         """
         Склеиваем 'List < String , Integer >' -> 'List<String,Integer>'.
         """
-        if not (self.current and getattr(self.current, "type", None) == "LT"):
+        if self.current.type != "LT":
             return base_type
         depth = 0
         out = [base_type]
-        while self.current and self.current.type != Token.EOF:
+        while self.current.type != Token.EOF:
             t = self.current
             if t.type == "LT":
                 depth += 1; out.append("<")
             elif t.type == "GT":
                 depth -= 1; out.append(">")
             else:
-                out.append(getattr(t, "text", t.type))
+                out.append(t.text)
             self.advance()
             if depth == 0:
                 break
         return "".join(out).replace(" ", "")
 
+    def _modifiers_end(self) -> int:
+        """
+        Индекс первого токена после цепочки модификаторов, начиная с курсора.
+        Для одного члена класса его спрашивают и _is_constructor_start, и
+        _looks_like_method_decl, поэтому результат запоминается для последней позиции.
+        """
+        i = self._i
+        if i == self._mods_from:
+            return self._mods_end
+        types = self._types
+        last = self._last
+        modifiers = self.MODIFIERS
+        j = i
+        while j < last and types[j] in modifiers:
+            j += 1
+        self._mods_from = i
+        self._mods_end = j
+        return j
+
+    def _array_suffix(self) -> str:
+        """
+        Съедает пары '[' ']' после типа и возвращает '[]' * n.
+        На '[' без парной ']' останавливается (сама '[' уже съедена).
+        """
+        n = 0
+        while self.current.type == "LBRACK":
+            self.advance()
+            if self.current.type != "RBRACK":
+                break
+            self.advance()
+            n += 1
+        return "[]" * n
+
     def _is_constructor_start(self):
         """
         [modifiers]* IDENTIFIER '('  и имя == текущему классу
         """
         if not self._current_class_name:
             return False
-        i = 1
-        while True:
-            t = self._peek_token(i)
-            if t is None:
-                return False
-            if getattr(t, "type", None) in self.MODIFIERS:
-                i += 1
-                continue
-            break
-        t = self._peek_token(i)
-        t2 = self._peek_token(i + 1)
-        if t is None:
+        i = self._modifiers_end()
+        # на EOF (i == _last) конструктора быть не может
+        if i >= self._last:
             return False
-        if getattr(t, "type", None) == "IDENTIFIER" and getattr(t2, "type", None) == "LPAREN":
-            return getattr(t, "text", None) == self._current_class_name
+        types = self._types
+        if types[i] == "IDENTIFIER" and types[i + 1] == "LPAREN":
+            return self._toks[i].text == self._current_class_name
         return False
 
     def _looks_like_method_decl(self):
-        i = 1
-        while self.peek_type(i) in self.MODIFIERS:
-            i += 1
-        if self.peek_type(i) in self.TYPE_KEYWORDS or self.peek_type(i) == "VOID" or self.peek_type(i) == "IDENTIFIER":
-            if self.peek_type(i + 1) == "IDENTIFIER" and self.peek_type(i + 2) == "LPAREN":
-                return True
-        return False
+        i = self._modifiers_end()
+        # [modifiers]* <type> IDENTIFIER '(' — все три токена должны быть до EOF
+        if i + 2 > self._last:
+            return False
+        types = self._types
+        return (types[i] in self.RETURN_TYPES and
+                types[i + 1] == "IDENTIFIER" and
+                types[i + 2] == "LPAREN")
 
     # --------------- entry ---------------
     def parse(self):
@@ -137,8 +220,9 @@ class SimpleJavaParser:
 
     def parse_compilation_unit(self):
         children = []
-        while self.current is not None and self.current.type != Token.EOF:
-            if self.current.type in self.MODIFIERS or self.current.type == "CLASS":
+        type_decl_start = self.TYPE_DECL_START
+        while self.current.type != Token.EOF:
+            if self.current.type in type_decl_start:
                 td = self.parse_type_declaration()
                 if td:
                     children.append(td)
@@ -151,25 +235,23 @@ class SimpleJavaParser:
     # --------------- type / class ---------------
     def parse_type_declaration(self):
         modifiers = []
-        while self.current is not None and self.current.type in self.MODIFIERS:
+        while self.current.type in self.MODIFIERS:
             modifiers.append(self.current.type)
             self.advance()
-        if self.current is not None and self.current.type == "CLASS":
+        if self.current.type == "CLASS":
             return self.parse_class_declaration(modifiers)
         return None
 
     def parse_class_declaration(self, modifiers=None):
         modifiers = modifiers or []
         self.match("CLASS")
-        if self.current is None:
-            raise SyntaxError("Ожидался идентификатор класса, получен EOF")
         class_name = self.current.text
         self.match("IDENTIFIER")
 
         # extends (одна база)
         bases = []
         if self.accept("EXTENDS"):
-            if self.current and self.current.type == "IDENTIFIER":
+            if self.current.type == "IDENTIFIER":
                 base = self.current.text
                 self.advance()
                 bases.append(base)
@@ -177,55 +259,54 @@ class SimpleJavaParser:
         self._current_class_name = class_name
 
         self.match("LBRACE")
-        body_children = []
+        # Modifiers (если есть) идут первым ребёнком — сразу кладём их в начало списка
+        body_children = [ASTNode("Modifiers", ",".join(modifiers))] if modifiers else []
 
         if bases:
             body_children.append(ASTNode("Base", ",".join(bases)))
 
-        while self.current is not None and self.current.type not in ("RBRACE", Token.EOF):
-            if (self.current.type in self.MODIFIERS or
-                self.current.type in self.TYPE_KEYWORDS or
-                self.current.type == "IDENTIFIER" or
-                self.current.type == "VOID"):
+        member_start = self.MEMBER_START
+        block_end = self.BLOCK_END
+        append = body_children.append
+        while self.current.type not in block_end:
+            if self.current.type in member_start:
 
                 if self._is_constructor_start():
                     node = self.parse_constructor_declaration()
                     if node:
-                        body_children.append(node)
+                        append(node)
                 elif self._looks_like_method_decl():
                     node = self.parse_method_declaration()
                     if node:
-                        body_children.append(node)
+                        append(node)
                 else:
                     node = self.parse_field_declaration()
                     if node:
-                        body_children.append(node)
+                        append(node)
             else:
                 if self.current.type == "LBRACE":
                     stmts = self.parse_block()
-                    body_children.append(ASTNode("Block", children=stmts))
+                    append(ASTNode("Block", children=stmts))
                 else:
                     self.advance()
 
-        if self.current is None or self.current.type == Token.EOF:
+        if self.current.type == Token.EOF:
             raise SyntaxError(f"Unclosed class body for class {class_name} — reached EOF without '}}'")
 
         self.match("RBRACE")
 
         node = ASTNode("ClassDecl", class_name, body_children)
-        if modifiers:
-            node.children.insert(0, ASTNode("Modifiers", ",".join(modifiers)))
 
         self._current_class_name = None
         return node
 
     def parse_constructor_declaration(self):
         modifiers = []
-        while self.current is not None and self.current.type in self.MODIFIERS:
+        while self.current.type in self.MODIFIERS:
             modifiers.append(self.current.type)
             self.advance()
 
-        if self.current is None or self.current.type != "IDENTIFIER":
+        if self.current.type != "IDENTIFIER":
             raise SyntaxError("Ожидалось имя конструктора")
         constructor_name = self.current.text
         self.match("IDENTIFIER")
@@ -235,164 +316,115 @@ class SimpleJavaParser:
         self.match("RPAREN")
 
         body = []
-        if self.current and self.current.type == "LBRACE":
+        if self.current.type == "LBRACE":
             body = self.parse_block()
 
-        node = ASTNode("ConstructorDecl", constructor_name, params + body)
-        if modifiers:
-            node.children.insert(0, ASTNode("Modifiers", ",".join(modifiers)))
-        return node
+        children = [ASTNode("Modifiers", ",".join(modifiers))] if modifiers else []
+        children += params
+        children += body
+        return ASTNode("ConstructorDecl", constructor_name, children)
 
     # --------------- fields / locals ---------------
     def parse_field_declaration(self):
         mods = []
-        while self.current and self.current.type in self.MODIFIERS:
+        while self.current.type in self.MODIFIERS:
             mods.append(self.current.type); self.advance()
 
         # тип
         type_tok = None
-        if self.current and (self.current.type in self.TYPE_KEYWORDS or self.current.type == "IDENTIFIER"):
+        if self.current.type in self.TYPE_START:
             type_tok = self.current.text; self.advance()
             # generics
             type_tok = self._maybe_generic_suffix(type_tok)
             # массивные скобки после типа
-            while self.current and self.current.type == "LBRACK":
-                self.advance()
-                if self.current and self.current.type == "RBRACK":
-                    self.advance()
-                    type_tok = (type_tok or "") + "[]"
-                else:
-                    break
+            type_tok += self._array_suffix()
         else:
-            if self.current:
-                self.advance()
+            self.advance()
             return ASTNode("FieldDecl", f"{type_tok} var", [])
 
+        mods_text = ",".join(mods)  # одна строка модификаторов на все переменные объявления
         decls = []
         while True:
-            if not (self.current and self.current.type == "IDENTIFIER"):
+            if self.current.type != "IDENTIFIER":
                 break
             name = self.current.text; self.advance()
 
-            init = None
+            fd_children = [ASTNode("Modifiers", mods_text)] if mods else []
             if self.accept("ASSIGN"):
-                # new-массив
-                if self.current and self.current.type == "NEW":
-                    self.advance()
-                    if self.current and (self.current.type in self.TYPE_KEYWORDS or self.current.type == "IDENTIFIER"):
-                        _ = self.current.text; self.advance()
-                        _ = self._maybe_generic_suffix(_)
-                    while self.current and self.current.type == "LBRACK":
-                        self.advance()
-                        if self.current and self.current.type != "RBRACK":
-                            _ = self.parse_expression()
-                        self.match("RBRACK")
-                    if self.current and self.current.type == "LBRACE":
-                        self.advance()
-                        elems = []
-                        while self.current and self.current.type != "RBRACE":
-                            elems.append(self.parse_expression())
-                            if self.current and self.current.type == "COMMA":
-                                self.advance()
-                        self.match("RBRACE")
-                        init = ASTNode("ArrayInit", None, elems)
-                    else:
-                        init = ASTNode("Unknown", "new-array")
-                # короткая форма { ... }
-                elif self.current and self.current.type == "LBRACE":
-                    self.advance()
-                    elems = []
-                    while self.current and self.current.type != "RBRACE":
-                        elems.append(self.parse_expression())
-                        if self.current and self.current.type == "COMMA":
-                            self.advance()
-                    self.match("RBRACE")
-                    init = ASTNode("ArrayInit", None, elems)
-                else:
-                    init = self.parse_expression()
-
-            fd_children = []
-            if mods:
-                fd_children.append(ASTNode("Modifiers", ",".join(mods)))
-            if init is not None:
-                fd_children.append(ASTNode("Init", None, [init]))
+                fd_children.append(ASTNode("Init", None, [self._parse_variable_initializer()]))
             decls.append(ASTNode("FieldDecl", f"{type_tok} {name}", fd_children))
 
-            if self.current and self.current.type == "COMMA":
+            if self.current.type == "COMMA":
                 self.advance()
                 continue
             break
 
-        if self.current and self.current.type == "SEMI":
+        if self.current.type == "SEMI":
             self.advance()
 
         return decls[0] if len(decls) == 1 else ASTNode("Block", children=decls)
 
+    def _parse_variable_initializer(self):
+        """
+        Инициализатор после '=' в объявлении поля/переменной:
+        new T[..]{...}, короткая форма {...} или обычное выражение.
+        """
+        # new-массив
+        if self.current.type == "NEW":
+            self.advance()
+            if self.current.type in self.TYPE_START:
+                _ = self.current.text; self.advance()
+                _ = self._maybe_generic_suffix(_)
+            while self.current.type == "LBRACK":
+                self.advance()
+                if self.current.type != "RBRACK":
+                    _ = self.parse_expression()
+                self.match("RBRACK")
+            if self.current.type == "LBRACE":
+                return self._parse_array_init()
+            return ASTNode("Unknown", "new-array")
+        # короткая форма { ... }
+        if self.current.type == "LBRACE":
+            return self._parse_array_init()
+        return self.parse_expression()
+
+    def _parse_array_init(self):
+        """
+        '{' expr (',' expr)* '}' -> ArrayInit; на EOF без '}' match сообщит об ошибке.
+        """
+        self.advance()
+        elems = []
+        while self.current.type not in self.BLOCK_END:
+            elems.append(self.parse_expression())
+            if self.current.type == "COMMA":
+                self.advance()
+        self.match("RBRACE")
+        return ASTNode("ArrayInit", None, elems)
+
     def parse_local_variable_declaration_no_semi(self):
-        while self.current and self.current.type in self.MODIFIERS:
+        while self.current.type in self.MODIFIERS:
             self.advance()
 
         type_tok = None
-        if self.current and (self.current.type in self.TYPE_KEYWORDS or self.current.type == "IDENTIFIER"):
+        if self.current.type in self.TYPE_START:
             type_tok = self.current.text; self.advance()
             type_tok = self._maybe_generic_suffix(type_tok)
-            while self.current and self.current.type == "LBRACK":
-                self.advance()
-                if self.current and self.current.type == "RBRACK":
-                    self.advance()
-                    type_tok = (type_tok or "") + "[]"
-                else:
-                    break
+            type_tok += self._array_suffix()
         else:
             return ASTNode("FieldDecl", f"{type_tok} var", [])
 
         decls = []
         while True:
-            if not (self.current and self.current.type == "IDENTIFIER"):
+            if self.current.type != "IDENTIFIER":
                 break
             name = self.current.text; self.advance()
 
-            init = None
+            fd_children = []
             if self.accept("ASSIGN"):
-                if self.current and self.current.type == "NEW":
-                    self.advance()
-                    if self.current and (self.current.type in self.TYPE_KEYWORDS or self.current.type == "IDENTIFIER"):
-                        _ = self.current.text; self.advance()
-                        _ = self._maybe_generic_suffix(_)
-                    while self.current and self.current.type == "LBRACK":
-                        self.advance()
-                        if self.current and self.current.type != "RBRACK":
-                            _ = self.parse_expression()
-                        self.match("RBRACK")
-                    if self.current and self.current.type == "LBRACE":
-                        self.advance()
-                        elems = []
-                        while self.current and self.current.type != "RBRACE":
-                            elems.append(self.parse_expression())
-                            if self.current and self.current.type == "COMMA":
-                                self.advance()
-                        self.match("RBRACE")
-                        init = ASTNode("ArrayInit", None, elems)
-                    else:
-                        init = ASTNode("Unknown", "new-array")
-                elif self.current and self.current.type == "LBRACE":
-                    self.advance()
-                    elems = []
-                    while self.current and self.current.type != "RBRACE":
-                        elems.append(self.parse_expression())
-                        if self.current and self.current.type == "COMMA":
-                            self.advance()
-                    self.match("RBRACE")
-                    init = ASTNode("ArrayInit", None, elems)
-                else:
-                    init = self.parse_expression()
-
-            fd = ASTNode("FieldDecl", f"{type_tok} {name}", [])
-            if init is not None:
-                fd.children.append(ASTNode("Init", None, [init]))
-            decls.append(fd)
+                fd_children.append(ASTNode("Init", None, [self._parse_variable_initializer()]))
+            decls.append(ASTNode("FieldDecl", f"{type_tok} {name}", fd_children))
 
-            if self.current and self.current.type == "COMMA":
+            if self.current.type == "COMMA":
                 self.advance()
                 continue
             break
@@ -402,23 +434,17 @@ class SimpleJavaParser:
     # --------------- methods ---------------
     def parse_method_declaration(self):
         modifiers = []
-        while self.current is not None and self.current.type in self.MODIFIERS:
+        while self.current.type in self.MODIFIERS:
             modifiers.append(self.current.type); self.advance()
 
         ret_type = None
-        if self.current is not None and (self.current.type in self.TYPE_KEYWORDS or self.current.type == "IDENTIFIER" or self.current.type == "VOID"):
+        if self.current.type in self.RETURN_TYPES:
             ret_type = self.current.text; self.advance()
-            while self.current is not None and self.current.type == "LBRACK":
-                self.advance()
-                if self.current and self.current.type == "RBRACK":
-                    ret_type = (ret_type or "") + "[]"; self.advance()
+            ret_type += self._array_suffix()
         else:
             ret_type = "<unknown>"
-            if self.current is not None:
-                self.advance()
+            self.advance()
 
-        if self.current is None:
-            raise SyntaxError("Ожидался идентификатор метода, получен EOF")
         method_name = self.current.text
         self.match("IDENTIFIER")
 
@@ -427,33 +453,34 @@ class SimpleJavaParser:
         self.match("RPAREN")
 
         body = []
-        if self.current and self.current.type == "LBRACE":
+        if self.current.type == "LBRACE":
             body = self.parse_block()
 
-        node = ASTNode("MethodDecl", f"{ret_type} {method_name}", params + body)
-        if modifiers:
-            node.children.insert(0, ASTNode("Modifiers", ",".join(modifiers)))
-        return node
+        children = [ASTNode("Modifiers", ",".join(modifiers))] if modifiers else []
+        children += params
+        children += body
+        return ASTNode("MethodDecl", f"{ret_type} {method_name}", children)
 
     def parse_parameter_list(self):
         params = []
-        while self.current is not None and self.current.type not in ("RPAREN", Token.EOF):
-            if self.current.type in self.MODIFIERS:
-                self.advance(); continue
-            if self.current.type in self.TYPE_KEYWORDS or self.current.type == "IDENTIFIER":
-                p_type = self.current.text; self.advance()
-                while self.current and self.current.type == "LBRACK":
-                    self.advance()
-                    if self.current and self.current.type == "RBRACK":
-                        p_type = (p_type or "") + "[]"; self.advance()
+        params_end = self.PARAMS_END
+        modifiers = self.MODIFIERS
+        type_start = self.TYPE_START
+        advance = self.advance
+        while self.current.type not in params_end:
+            if self.current.type in modifiers:
+                advance(); continue
+            if self.current.type in type_start:
+                p_type = self.current.text; advance()
+                p_type += self._array_suffix()
             else:
-                p_type = "<unknown>"; self.advance()
+                p_type = "<unknown>"; advance()
             p_name = None
-            if self.current is not None and self.current.type == "IDENTIFIER":
-                p_name = self.current.text; self.advance()
+            if self.current.type == "IDENTIFIER":
+                p_name = self.current.text; advance()
             params.append(ASTNode("Param", f"{p_type} {p_name}"))
-            if self.current is not None and self.current.type == "COMMA":
-                self.advance(); continue
+            if self.current.type == "COMMA":
+                advance(); continue
             else:
                 break
         return params
@@ -461,278 +488,293 @@ class SimpleJavaParser:
     # --------------- blocks / statements ---------------
     def parse_block(self):
         stmts = []
-        if self.current is not None and self.current.type == "LBRACE":
+        if self.current.type == "LBRACE":
             self.advance()
         else:
             return []
-        while self.current is not None and self.current.type not in ("RBRACE", Token.EOF):
-            stmts.append(self.parse_statement())
-        if self.current is None or self.current.type == Token.EOF:
+        parse_statement = self.parse_statement
+        append = stmts.append
+        while self.current.type not in self.BLOCK_END:
+            append(parse_statement())
+        if self.current.type == Token.EOF:
             raise SyntaxError("Reached EOF while parsing a block — missing '}'")
         self.advance()  # RBRACE
         return stmts
 
     def _looks_like_local_decl_start(self) -> bool:
-        t1 = self._peek_token(1)
-        if t1 is None:
-            return False
-        if t1.type != "IDENTIFIER":
+        types = self._types
+        last = self._last
+        i = self._i
+        if types[i] != "IDENTIFIER":
             return False
-
-        i = 2
+        i += 1
 
         # generics <...>
-        if self.peek_type(i) == "LT":
+        if types[i] == "LT":
             depth = 0
             while True:
-                tok = self._peek_token(i)
-                if tok is None:
+                # незакрытый '<' до самого EOF — это не объявление
+                if i >= last:
                     return False
-                if tok.type == "LT":
+                tt = types[i]
+                if tt == "LT":
                     depth += 1
-                elif tok.type == "GT":
+                elif tt == "GT":
                     depth -= 1
                 i += 1
                 if depth == 0:
                     break
 
-        # массивные []
-        while self.peek_type(i) == "LBRACK" and self.peek_type(i + 1) == "RBRACK":
+        # массивные [] (перед EOF всегда есть ещё токен, так что i + 1 в границах)
+        while types[i] == "LBRACK" and types[i + 1] == "RBRACK":
             i += 2
 
-        return self.peek_type(i) == "IDENTIFIER"
+        return types[i] == "IDENTIFIER"
 
     def parse_statement(self):
-        if self.current is None:
-            return ASTNode("Empty")
-
-        if self.current.type == "IF":
-            return self.parse_if_statement()
-        if self.current.type == "SWITCH":
-            return self.parse_switch_statement()
-        if self.current.type == "FOR":
-            return self.parse_for_statement()
-        if self.current.type == "WHILE":
-            return self.parse_while_statement()
-        if self.current.type == "DO":
-            return self.parse_do_while_statement()
-        if self.current.type == "TRY":
-            return self.parse_try_statement()
-        if self.current.type == "BREAK":
-            self.advance()
-            if self.current and self.current.type == "SEMI":
-                self.advance()
-            return ASTNode("Break")
-        if self.current.type == "CONTINUE":
-            self.advance()
-            if self.current and self.current.type == "SEMI":
-                self.advance()
-            return ASTNode("Continue")
-        if self.current.type == "RETURN":
-            self.advance()
-            expr = None
-            if self.current and self.current.type != "SEMI":
-                expr = self.parse_expression()
-            if self.current and self.current.type == "SEMI":
-                self.advance()
-            return ASTNode("Return", children=[expr] if expr else [])
-        if self.current.type == "LBRACE":
-            stmts = self.parse_block()
-            return ASTNode("Block", children=stmts)
+        ct = self.current.type
+
+        # операторы, начинающиеся с ключевого слова или '{' — через таблицу
+        handler = self.STATEMENT_PARSERS.get(ct)
+        if handler is not None:
+            return handler(self)
 
         # локальные объявления простых типов
-        if self.current.type in self.TYPE_KEYWORDS:
+        if ct in self.TYPE_KEYWORDS:
             node = self.parse_field_declaration()
             return node
 
         # локальные объявления пользовательских/дженерик типов
-        if self.current.type == "IDENTIFIER" and self._looks_like_local_decl_start():
+        if ct == "IDENTIFIER" and self._looks_like_local_decl_start():
             node = self.parse_local_variable_declaration_no_semi()
-            if self.current and self.current.type == "SEMI":
+            if self.current.type == "SEMI":
                 self.advance()
             return node
 
         # выражение / присваивание / составное присваивание
         left = self.parse_expression()
+        ct = self.current.type
 
         # простое присваивание
-        if self.current is not None and self.current.type == "ASSIGN":
+        if ct == "ASSIGN":
             self.advance()
             right = self.parse_expression()
             node = ASTNode("Assign", None, [left, right])
-            if self.current and self.current.type == "SEMI":
+            if self.current.type == "SEMI":
                 self.advance()
             return node
 
         # составные присваивания
-        compound = {
-            "ADD_ASSIGN": "ADD",
-            "SUB_ASSIGN": "SUB",
-            "MUL_ASSIGN": "MUL",
-            "DIV_ASSIGN": "DIV",
-            "MOD_ASSIGN": "MOD",
-            "AND_ASSIGN": "BITAND",
-            "OR_ASSIGN":  "BITOR",
-            "XOR_ASSIGN": "CARET",
-            "LSHIFT_ASSIGN": "LSHIFT",
-            "RSHIFT_ASSIGN": "RSHIFT",
-            "URSHIFT_ASSIGN": "URSHIFT",
-        }
-        if self.current is not None and self.current.type in compound:
-            op = compound[self.current.type]
+        compound = self.COMPOUND_ASSIGN
+        if ct in compound:
+            op = compound[ct]
             self.advance()
             rhs = self.parse_expression()
             # превращаем `a <op>= b` в Assign( a , BinaryOp(<op>, [a, b]) )
             node = ASTNode("Assign", None, [left, ASTNode("BinaryOp", op, [left, rhs])])
-            if self.current and self.current.type == "SEMI":
+            if self.current.type == "SEMI":
                 self.advance()
             return node
 
         # точка с запятой после выражения
-        if self.current and self.current.type == "SEMI":
+        if ct == "SEMI":
             self.advance()
         return ASTNode("ExprStmt", None, [left])
 
+    def parse_break_statement(self):
+        self.advance()
+        if self.current.type == "SEMI":
+            self.advance()
+        return ASTNode("Break")
+
+    def parse_continue_statement(self):
+        self.advance()
+        if self.current.type == "SEMI":
+            self.advance()
+        return ASTNode("Continue")
+
+    def parse_return_statement(self):
+        self.advance()
+        expr = None
+        if self.current.type != "SEMI":
+            expr = self.parse_expression()
+        if self.current.type == "SEMI":
+            self.advance()
+        return ASTNode("Return", children=[expr] if expr else [])
+
+    def parse_block_statement(self):
+        stmts = self.parse_block()
+        return ASTNode("Block", children=stmts)
+
     def parse_if_statement(self):
-        self.match("IF")
-        self.match("LPAREN")
-        cond = self.parse_expression()
-        self.match("RPAREN")
-        then_block = ASTNode("Then", children=self.parse_block())
-        else_node = None
-        if self.accept("ELSE"):
-            if self.current and self.current.type == "IF":
-                else_node = self.parse_if_statement()
-            elif self.current and self.current.type == "LBRACE":
-                else_block_children = self.parse_block()
-                else_node = ASTNode("Else", children=else_block_children)
+        """
+        Цепочка `else if` разбирается циклом, а не рекурсией: каждое звено — это
+        IfStatement, вложенный вторым ребёнком в предыдущее, как и раньше, но длинные
+        цепочки не расходуют стек вызовов.
+        """
+        root = None
+        parent_children = None  # дети IfStatement, чьим else является текущее звено
+        while True:
+            self.match("IF")
+            self.match("LPAREN")
+            cond = self.parse_expression()
+            self.match("RPAREN")
+            children = [ASTNode("Then", children=self.parse_block())]
+            node = ASTNode("IfStatement", cond, children)
+            if parent_children is None:
+                root = node
+            else:
+                parent_children.append(node)
+            if not self.accept("ELSE"):
+                break
+            if self.current.type == "IF":
+                parent_children = children
+                continue
+            if self.current.type == "LBRACE":
+                children.append(ASTNode("Else", children=self.parse_block()))
             else:
-                else_stmt = self.parse_statement()
-                else_node = ASTNode("Else", children=[else_stmt])
-        return ASTNode("IfStatement", cond, [then_block] + ([else_node] if else_node else []))
+                children.append(ASTNode("Else", children=[self.parse_statement()]))
+            break
+        return root
 
     # --------------- try/catch/finally ---------------
     def parse_try_statement(self):
         self.match("TRY")
         try_block = ASTNode("TryBlock", None, self.parse_block())
 
-        catches = []
-        while self.current and self.current.type == "CATCH":
+        children = [try_block]  # TryBlock, затем Catch*, затем Finally
+        while self.current.type == "CATCH":
             self.advance()
             self.match("LPAREN")
             ex_type = None
             var_name = None
-            if self.current and (self.current.type in self.TYPE_KEYWORDS or self.current.type == "IDENTIFIER"):
+            if self.current.type in self.TYPE_START:
                 ex_type = self.current.text
                 self.advance()
-            if self.current and self.current.type == "IDENTIFIER":
+            if self.current.type == "IDENTIFIER":
                 var_name = self.current.text
                 self.advance()
             self.match("RPAREN")
             catch_block = self.parse_block()
-            catches.append(ASTNode("Catch", f"{ex_type} {var_name}".strip(), catch_block))
+            children.append(ASTNode("Catch", f"{ex_type} {var_name}".strip(), catch_block))
 
-        finally_node = None
         if self.accept("FINALLY"):
             finally_block = self.parse_block()
-            finally_node = ASTNode("Finally", None, finally_block)
+            children.append(ASTNode("Finally", None, finally_block))
 
-        children = [try_block] + catches + ([finally_node] if finally_node else [])
         return ASTNode("TryStatement", None, children)
 
     # --------------- expressions ---------------
     def parse_expression(self, min_prec=0):
-        left = self.parse_primary()
+        """
+        Бинарные операторы разбираются без рекурсии: операнды и ещё не свёрнутые
+        операторы лежат на стеках (shunting-yard), все операторы левоассоциативны.
+        """
+        precedence = self.PRECEDENCE
+        advance = self.advance
+        parse_primary = self.parse_primary
+        node = ASTNode  # локальное имя вместо глобального поиска при каждой свёртке
+        first = parse_primary()
+        # чаще всего выражение — один операнд (аргумент, индекс, правая часть):
+        # тогда стеки не нужны
+        op_type = self.current.type
+        if op_type != "QUESTION" and precedence.get(op_type, -1) < min_prec:
+            return first
+        operands = [first]
+        ops = []  # (тип оператора, приоритет)
         while True:
-            if self.current is None:
-                break
-            # тернарный ?:  (низкий приоритет, право-ассоциативный)
-            if self.current.type == "QUESTION":
-                self.advance()
+            op_type = self.current.type
+            # тернарный ?:  (низкий приоритет, право-ассоциативный);
+            # применяется к последнему операнду, как и при рекурсивном разборе
+            if op_type == "QUESTION":
+                advance()
                 texpr = self.parse_expression()
                 self.match("COLON")
-                fexpr = self.parse_expression(min_prec)
-                left = ASTNode("Ternary", None, [left, texpr, fexpr])
+                fexpr = self.parse_expression(ops[-1][1] + 1 if ops else min_prec)
+                operands[-1] = node("Ternary", None, [operands[-1], texpr, fexpr])
                 continue
 
-            op_type = self.current.type
-            prec = self.PRECEDENCE.get(op_type, -1)
+            prec = precedence.get(op_type, -1)
+            # сворачиваем операторы с приоритетом не ниже текущего
+            while ops and prec <= ops[-1][1]:
+                right = operands.pop()
+                operands[-1] = node("BinaryOp", ops.pop()[0], [operands[-1], right])
             if prec < min_prec:
                 break
-            op_tok = self.current
-            self.advance()
-            right = self.parse_expression(prec + 1)
-            left = ASTNode("BinaryOp", op_tok.type, [left, right])
-        return left
+            advance()
+            ops.append((op_type, prec))
+            operands.append(parse_primary())
+        return operands[0]
 
     def parse_primary(self):
-        if self.current is None:
-            return ASTNode("Empty")
-
-        # префиксные унарные: ++ -- ! + - ~
-        if self.current.type in ("INC", "DEC", "BANG", "ADD", "SUB", "TILDE"):
-            op = self.current.type
-            self.advance()
-            operand = self.parse_primary()
-            return ASTNode("PrefixOp", op, [operand])
-
-        # ( ... )
-        if self.current.type == "LPAREN":
-            self.advance()
-            expr = self.parse_expression()
-            self.match("RPAREN")
-            return expr
-
-        # числовые/строковые/символьные
-        if self.current.type in ("NUMBER", "STRING", "CHAR"):
-            val = self.current.text
-            self.advance()
-            return ASTNode("Literal", val)
-
-        # булевы и null как литералы (если лексер выделяет их отдельными токенами)
-        if self.current.type in ("TRUE", "FALSE", "NULL"):
-            lit = self.current.text
-            self.advance()
-            return ASTNode("Literal", lit)
+        # ветки проверяются в порядке частоты: идентификаторы, литералы, скобки, унарные
+        cur = self.current
+        ct = cur.type
 
         # идентификатор/this/super, вызовы, член‑доступ, постфикс ++/--
-        if self.current.type in ("IDENTIFIER", "THIS", "SUPER"):
-            name = self.current.text.lower() if self.current.type in ("THIS", "SUPER") else self.current.text
-            base = ASTNode("Identifier", name)
-            self.advance()
+        if ct in ("IDENTIFIER", "THIS", "SUPER"):
+            name = cur.text if ct == "IDENTIFIER" else cur.text.lower()
+            node = ASTNode
+            base = node("Identifier", name)
+            advance = self.advance
+            advance()
             while True:
-                if self.current is not None and self.current.type == "DOT":
-                    self.advance()
-                    if self.current and self.current.type == "IDENTIFIER":
-                        member_name = self.current.text
-                        self.advance()
-                        base = ASTNode("Member", member_name, [base])
+                ct = self.current.type
+                if ct == "DOT":
+                    advance()
+                    member = self.current
+                    if member.type == "IDENTIFIER":
+                        advance()
+                        base = node("Member", member.text, [base])
                         continue
                     break
-                if self.current is not None and self.current.type == "LPAREN":
-                    self.advance()
+                if ct == "LPAREN":
+                    advance()
                     args = []
-                    if self.current is not None and self.current.type != "RPAREN":
+                    if self.current.type != "RPAREN":
                         args.append(self.parse_expression())
-                        while self.current is not None and self.current.type == "COMMA":
-                            self.advance()
+                        while self.current.type == "COMMA":
+                            advance()
                             args.append(self.parse_expression())
                     self.match("RPAREN")
-                    base = ASTNode("Call", base, args)
+                    base = node("Call", base, args)
                     continue
-                if self.current is not None and self.current.type in ("INC", "DEC"):
-                    op = self.current.type
-                    self.advance()
-                    base = ASTNode("PostfixOp", op, [base])
+                if ct == "INC" or ct == "DEC":
+                    advance()
+                    base = node("PostfixOp", ct, [base])
                     continue
                 break
             return base
 
+        # числовые/строковые/символьные, а также булевы и null
+        # (если лексер выделяет их отдельными токенами)
+        if ct in ("NUMBER", "STRING", "CHAR", "TRUE", "FALSE", "NULL"):
+            self.advance()
+            return ASTNode("Literal", cur.text)
+
+        # ( ... )
+        if ct == "LPAREN":
+            self.advance()
+            expr = self.parse_expression()
+            self.match("RPAREN")
+            return expr
+
+        # префиксные унарные: ++ -- ! + - ~ — цепочка (`- - !x`) собирается циклом,
+        # операнд разбирается один раз, затем оборачивается изнутри наружу
+        if ct in ("INC", "DEC", "BANG", "ADD", "SUB", "TILDE"):
+            prefix_ops = []
+            while ct in ("INC", "DEC", "BANG", "ADD", "SUB", "TILDE"):
+                prefix_ops.append(ct)
+                self.advance()
+                ct = self.current.type
+            operand = self.parse_primary()
+            for op in reversed(prefix_ops):
+                operand = ASTNode("PrefixOp", op, [operand])
+            return operand
+
         # fallback
-        token_text = getattr(self.current, "text", None)
-        token_type = getattr(self.current, "type", None)
         self.advance()
-        return ASTNode("Unknown", f"{token_type}:{token_text}")
+        return ASTNode("Unknown", f"{ct}:{cur.text}")
 
     # --------------- while / do-while / for ---------------
     def parse_while_statement(self):
@@ -750,7 +792,7 @@ class SimpleJavaParser:
         self.match("LPAREN")
         condition = self.parse_expression()
         self.match("RPAREN")
-        if self.current and self.current.type == "SEMI":
+        if self.current.type == "SEMI":
             self.advance()
         return ASTNode("DoWhileStatement", children=[condition, body])
 
@@ -758,28 +800,26 @@ class SimpleJavaParser:
         self.match("FOR")
         self.match("LPAREN")
 
-        # ищем foreach (':' до первой ';')
-        lookahead_index = 1
-        found_colon = False
-        while True:
-            t = self.tokens.LT(lookahead_index)
-            if t is None:
-                break
-            if t.type == "COLON":
-                found_colon = True
-                break
-            if t.type == "SEMI" or t.type == "RPAREN":
-                break
-            lookahead_index += 1
+        # ищем foreach (':' до первой ';' или ')'), не дальше EOF
+        types = self._types
+        i = self._i
+        stop = self._last
+        for end_type in ("SEMI", "RPAREN"):
+            try:
+                stop = types.index(end_type, i, stop)
+            except ValueError:
+                pass
+        try:
+            types.index("COLON", i, stop)
+            found_colon = True
+        except ValueError:
+            found_colon = False
 
         if found_colon:
             first_type = None
-            if self.current.type in self.TYPE_KEYWORDS or self.current.type == "IDENTIFIER":
+            if self.current.type in self.TYPE_START:
                 first_type = self.current.text; self.advance()
-                while self.current and self.current.type == "LBRACK":
-                    self.advance()
-                    if self.current and self.current.type == "RBRACK":
-                        first_type = (first_type or "") + "[]"; self.advance()
+                first_type += self._array_suffix()
             var_name = None
             if self.current.type == "IDENTIFIER":
                 var_name = self.current.text; self.advance()
@@ -797,14 +837,14 @@ class SimpleJavaParser:
                 init = self.parse_local_variable_declaration_no_semi()
             else:
                 init = self.parse_expression()
-        if self.current and self.current.type == "SEMI":
+        if self.current.type == "SEMI":
             self.advance()
         else:
             raise SyntaxError("Ожидался ';' в заголовке for")
         condition = None
         if self.current.type != "SEMI":
             condition = self.parse_expression()
-        if self.current and self.current.type == "SEMI":
+        if self.current.type == "SEMI":
             self.advance()
         else:
             raise SyntaxError("Ожидался ';' в заголовке for (между условием и обновлением)")
@@ -821,29 +861,49 @@ class SimpleJavaParser:
         self.match("LPAREN")
         expr = self.parse_expression()
         self.match("RPAREN")
-        if self.current and self.current.type == "LBRACE":
+        if self.current.type == "LBRACE":
             self.advance()
-        cases = []
-        while self.current is not None and self.current.type not in ("RBRACE", Token.EOF):
-            if self.current.type == "CASE":
-                self.advance()
+        children = [expr]  # выражение, затем метки case/default
+        block_end = self.BLOCK_END
+        section_end = self.SWITCH_SECTION_END
+        parse_statement = self.parse_statement
+        advance = self.advance
+        while self.current.type not in block_end:
+            ct = self.current.type
+            if ct == "CASE":
+                advance()
                 case_val = self.parse_expression()
-                if self.current and self.current.type == "COLON":
-                    self.advance()
+                if self.current.type == "COLON":
+                    advance()
+                stmts = [case_val]
+                while self.current.type not in section_end:
+                    stmts.append(parse_statement())
+                children.append(ASTNode("CaseLabel", None, stmts))
+            elif ct == "DEFAULT":
+                advance()
+                if self.current.type == "COLON":
+                    advance()
                 stmts = []
-                while self.current is not None and self.current.type not in ("CASE", "DEFAULT", "RBRACE"):
-                    stmts.append(self.parse_statement())
-                cases.append(ASTNode("CaseLabel", None, [case_val] + stmts))
-            elif self.current.type == "DEFAULT":
-                self.advance()
-                if self.current and self.current.type == "COLON":
-                    self.advance()
-                stmts = []
-                while self.current is not None and self.current.type not in ("CASE", "DEFAULT", "RBRACE"):
-                    stmts.append(self.parse_statement())
-                cases.append(ASTNode("DefaultLabel", None, stmts))
+                while self.current.type not in section_end:
+                    stmts.append(parse_statement())
+                children.append(ASTNode("DefaultLabel", None, stmts))
             else:
-                self.advance()
-        if self.current and self.current.type == "RBRACE":
+                advance()
+        if self.current.type == "RBRACE":
             self.advance()
-        return ASTNode("SwitchStatement", None, [expr] + cases)
+        return ASTNode("SwitchStatement", None, children)
+
+    # --------------- statement dispatch ---------------
+    # первый токен оператора -> метод разбора (функции класса, вызываются как handler(self))
+    STATEMENT_PARSERS = {
+        "IF": parse_if_statement,
+        "SWITCH": parse_switch_statement,
+        "FOR": parse_for_statement,
+        "WHILE": parse_while_statement,
+        "DO": parse_do_while_statement,
+        "TRY": parse_try_statement,
+        "BREAK": parse_break_statement,
+        "CONTINUE": parse_continue_statement,
+        "RETURN": parse_return_statement,
+        "LBRACE": parse_block_statement,
+    }
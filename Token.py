@@ -40,6 +40,8 @@ class Token(object):
 
 
 class CommonToken(Token):
+    __slots__ = ()
+
     EMPTY_SOURCE = (None, None)
 
     def __init__(self, source: tuple = EMPTY_SOURCE, type: int = None, channel: int = Token.DEFAULT_CHANNEL, start: int = -1, stop: int = -1):
@@ -116,10 +118,18 @@ class CommonTokenFactory:
     DEFAULT = None
     
     def create(self, source, type_, text, channel, start, stop, line, column):
-        t = CommonToken(source, type_, channel, start, stop)
-        t._text = text
+        # все поля известны заранее — заполняем их напрямую, минуя цепочку __init__
+        # (CommonToken.__init__ всё равно вычислил бы line/column, которые здесь перезаписываются)
+        t = CommonToken.__new__(CommonToken)
+        t.source = source
+        t.type = type_
+        t.channel = channel
+        t.start = start
+        t.stop = stop
+        t.tokenIndex = -1
         t.line = line
         t.column = column
+        t._text = text
         return t
 
 
@@ -6,11 +6,7 @@ class TokenStream:
         self._fill_tokens()
 
     def _fill_tokens(self):
-        while True:
-            tok = self.lexer.nextToken()
-            self.tokens.append(tok)
-            if tok.type == tok.EOF:
-                break
+        self.tokens.extend(self.lexer.getAllTokens())
 
     def LT(self, k: int):
         index = self.pos + k - 1
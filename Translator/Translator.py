@@ -1,24 +1,112 @@
 import re
-from typing import Optional, Any, List, Tuple
+from functools import lru_cache
+from typing import Optional, List, Tuple
 
 INDENT_STR = "    "
 
 # ---------------- type mapping helpers ----------------
 
+# базовые типы Java (и возможные лексерные метки) -> аннотация Python
+_BASE_TYPE_MAP = {
+    "byte": "int", "short": "int", "int": "int", "integer": "int", "long": "int",
+    "float": "float", "double": "float",
+    "boolean": "bool", "bool": "bool",
+    "char": "str", "character": "str",
+    "string": "str", "object": "object",
+    "void": "None",
+    # возможные лексерные метки
+    "decimal_literal": "int",
+    "float_literal": "float",
+    "hex_float_literal": "float",
+    "bool_literal": "bool",
+    "string_literal": "str",
+    "text_block": "str",
+}
+
+# коллекции Java -> контейнер Python
+_GENERIC_TYPE_MAP = {
+    "list": "list", "arraylist": "list",
+    "set": "set", "hashset": "set",
+    "map": "dict", "hashmap": "dict",
+    "optional": "Optional",
+}
+
+# форма лексемы NUMBER; такое int()/float() принимают всегда
+_NUMBER_RE = re.compile(r"[0-9]+(?:\.[0-9]+)?(?:[eE][+-]?[0-9]+)?")
+
+# экранирование значения, заворачиваемого в двойные кавычки
+_STR_ESCAPE_TABLE = str.maketrans({"\\": "\\\\", '"': '\\"'})
+
+_LT_RE = re.compile(r"\s*<\s*")
+_GT_RE = re.compile(r"\s*>\s*")
+_COMMA_RE = re.compile(r"\s*,\s*")
+
+
+def _split_top_level(s: str, sep: str = ","):
+    out, cur, depth = [], [], 0
+    for ch in s:
+        if ch == "<":
+            depth += 1
+        elif ch == ">":
+            depth -= 1
+        if ch == sep and depth == 0:
+            out.append("".join(cur).strip())
+            cur = []
+        else:
+            cur.append(ch)
+    if cur:
+        out.append("".join(cur).strip())
+    return out
+
+
+def _parse_generic(s: str):
+    if "<" not in s or not s.endswith(">"):
+        return s, None
+    base = s[:s.index("<")]
+    args_part = s[s.index("<")+1:-1]
+    return base, _split_top_level(args_part, ",")
+
+
+def _to_py_type(s: str) -> str:
+    s = s.strip()
+    base, args = _parse_generic(s)
+    b = base.lower()
+    kind = _GENERIC_TYPE_MAP.get(b)
+    if args is None:
+        py = _BASE_TYPE_MAP.get(b)
+        if py is not None:
+            return py
+        if kind is None:
+            return base
+        return "dict[Any, Any]" if kind == "dict" else f"{kind}[Any]"
+    # неизвестный generic — оставляем базу (тип-псевдоним/класс пользователя)
+    if kind is None:
+        return base
+    # generic args
+    mapped = [_to_py_type(a) for a in args]
+    if kind == "dict":
+        k = mapped[0] if len(mapped) > 0 else "Any"
+        v = mapped[1] if len(mapped) > 1 else "Any"
+        return f"dict[{k}, {v}]"
+    return f"{kind}[{mapped[0] if mapped else 'Any'}]"
+
+
+@lru_cache(maxsize=512)
 def map_java_type_to_py(java_type: Optional[str]) -> str:
     """
     Конвертация Java-типа в питоновскую аннотацию.
     Поддержка: примитивы/обёртки, []-массивы, generics (List/Set/Map/Optional),
     вложенные generics, нормализация пробелов в угловых скобках.
+    Чистая функция от строки, а типов в программе немного — результат кешируется.
     """
     if not java_type:
         return "Any"
 
     jt = str(java_type).strip()
     # нормализуем пробелы: "List < String >" -> "List<String>"
-    jt = re.sub(r"\s*<\s*", "<", jt)
-    jt = re.sub(r"\s*>\s*", ">", jt)
-    jt = re.sub(r"\s*,\s*", ",", jt)
+    jt = _LT_RE.sub("<", jt)
+    jt = _GT_RE.sub(">", jt)
+    jt = _COMMA_RE.sub(",", jt)
 
     # снимаем []-суффиксы, посчитаем глубину массивов
     array_depth = 0
@@ -26,80 +114,7 @@ def map_java_type_to_py(java_type: Optional[str]) -> str:
         array_depth += 1
         jt = jt[:-2]
 
-    base_map = {
-        "byte": "int", "short": "int", "int": "int", "integer": "int", "long": "int",
-        "float": "float", "double": "float",
-        "boolean": "bool", "bool": "bool",
-        "char": "str", "character": "str",
-        "string": "str", "object": "object",
-        "void": "None",
-        # возможные лексерные метки
-        "decimal_literal": "int",
-        "float_literal": "float",
-        "hex_float_literal": "float",
-        "bool_literal": "bool",
-        "string_literal": "str",
-        "text_block": "str",
-    }
-
-    def split_top_level(s: str, sep: str = ","):
-        out, cur, depth = [], [], 0
-        for ch in s:
-            if ch == "<":
-                depth += 1
-            elif ch == ">":
-                depth -= 1
-            if ch == sep and depth == 0:
-                out.append("".join(cur).strip())
-                cur = []
-            else:
-                cur.append(ch)
-        if cur:
-            out.append("".join(cur).strip())
-        return out
-
-    def parse_generic(s: str):
-        if "<" not in s or not s.endswith(">"):
-            return s, None
-        base = s[:s.index("<")]
-        args_part = s[s.index("<")+1:-1]
-        return base, split_top_level(args_part, ",")
-
-    def to_py(s: str) -> str:
-        s = s.strip()
-        base, args = parse_generic(s)
-        b = base.lower()
-        if args is None:
-            if b in base_map:
-                return base_map[b]
-            if b in ("list", "arraylist"):
-                return "list[Any]"
-            if b in ("set", "hashset"):
-                return "set[Any]"
-            if b in ("map", "hashmap"):
-                return "dict[Any, Any]"
-            if b == "optional":
-                return "Optional[Any]"
-            return base
-        # generic args
-        mapped = [to_py(a) for a in args]
-        if b in ("list", "arraylist"):
-            return f"list[{mapped[0] if mapped else 'Any'}]"
-        if b in ("set", "hashset"):
-            return f"set[{mapped[0] if mapped else 'Any'}]"
-        if b in ("map", "hashmap"):
-            k = mapped[0] if len(mapped) > 0 else "Any"
-            v = mapped[1] if len(mapped) > 1 else "Any"
-            return f"dict[{k}, {v}]"
-        if b == "optional":
-            return f"Optional[{mapped[0] if mapped else 'Any'}]"
-        # неизвестный generic — оставляем базу (тип-псевдоним/класс пользователя)
-        return base
-
-    py = to_py(jt)
-    for _ in range(array_depth):
-        py = f"list[{py}]"
-    return py
+    return "list[" * array_depth + _to_py_type(jt) + "]" * array_depth
 
 
 def default_for_type(py_type: Optional[str]) -> str:
@@ -123,48 +138,40 @@ def default_for_type(py_type: Optional[str]) -> str:
 # ---------------- translator ----------------
 
 class Translator:
+    # BinaryOp (тип токена оператора) -> оператор Python
+    BINARY_OP_MAP = {
+        "GT": ">", "LT": "<", "GE": ">=", "LE": "<=",
+        "EQUAL": "==", "NOTEQUAL": "!=",
+        "ADD": "+", "SUB": "-", "MUL": "*", "DIV": "/", "MOD": "%",
+        "AND": "and", "OR": "or",
+        "BITAND": "&", "BITOR": "|", "CARET": "^",
+        "LSHIFT": "<<", "RSHIFT": ">>", "URSHIFT": ">>",
+    }
+    # PostfixOp (тип токена) -> окончание выражения Python
+    POSTFIX_OP_SUFFIXES = {"INC": " += 1", "DEC": " -= 1"}
+    # PrefixOp (тип токена) -> шаблон выражения Python
+    PREFIX_OP_FORMATS = {
+        "INC": "{} += 1", "DEC": "{} -= 1",
+        "BANG": "not {}", "TILDE": "~({})",
+        "ADD": "+({})", "SUB": "-({})",
+    }
+    # true/false/null (регистр не важен) -> константы Python; и для литералов, и для идентификаторов
+    KEYWORD_LITERALS = {"true": "True", "false": "False", "null": "None"}
+    # `x = x <op> y` -> `x <op>= y`
+    AUGMENTED_OP_MAP = {"ADD": "+=", "SUB": "-=", "MUL": "*=", "DIV": "/=", "MOD": "%=", "BITAND": "&=", "BITOR": "|=", "CARET": "^=", "LSHIFT": "<<=", "RSHIFT": ">>="}
+
     def __init__(self, indent_str: str = INDENT_STR):
         self.indent_str = indent_str
         self.indent_level = 0
+        # строки отступа по уровням, растут по мере надобности; текущая — _cur_indent
+        self._indent_cache = [""]
+        self._cur_indent = ""
         self._in_constructor = False
-
-    def indent(self) -> str:
-        return self.indent_str * self.indent_level
-
-    def _format_literal_token(self, raw_value) -> str:
-        if raw_value is None:
-            return '""'
-        s = str(raw_value)
-        ls = s.lower()
-        if ls == "null":  return "None"
-        if ls == "true":  return "True"
-        if ls == "false": return "False"
-        if (s.startswith('"') and s.endswith('"')) or (s.startswith("'") and s.endswith("'")):
-            return s
-        try:
-            int(s)
-            return s
-        except Exception:
-            try:
-                float(s)
-                return s
-            except Exception:
-                pass
-        esc = s.replace('"', '\\"')
-        return f'"{esc}"'
-
-    def translate(self, ast) -> str:
-        return self._translate_node(ast)
-
-    # ---------- центральный диспетчер ----------
-
-    def _translate_node(self, node):
-        if node is None:
-            return ""
-        dispatch = {
+        # тип узла -> метод трансляции; собирается один раз на транслятор,
+        # а не заново при каждом вызове _translate_node
+        self._dispatch = {
             "CompilationUnit": self._trans_compilation_unit,
             "ClassDecl": self._trans_class_decl,
-            "Modifiers": self._trans_modifiers,
             "MethodDecl": self._trans_method_decl,
             "ConstructorDecl": self._trans_constructor_decl,
             "Param": self._trans_param,
@@ -194,31 +201,132 @@ class Translator:
             "PostfixOp": self._trans_postfixop,
             "PrefixOp": self._trans_prefixop,
             "TryStatement": self._trans_try_statement,
-            "Base": lambda n: "",  # служебный узел (базовые классы) — печатается в заголовке
+            "Base": lambda n, out: None,  # служебный узел (базовые классы) — печатается в заголовке
+            # Modifiers сюда не попадают: объявления снимают их с детей сами
         }
-        fn = dispatch.get(node.type, None)
-        if fn:
-            return fn(node)
-        # fallback: просто обходим детей
-        out_lines = []
-        for c in node.children:
-            if c is None:
-                continue
-            if isinstance(c, str):
-                out_lines.append(self.indent() + c)
+        # тип узла-выражения -> метод, возвращающий его исходник на Python
+        # (листья Identifier/Literal разбираются прямо в _expr_to_source)
+        self._expr_dispatch = {
+            "Paren": self._src_paren,
+            "Member": self._src_member,
+            "Call": self._src_call,
+            "BinaryOp": self._src_binaryop,
+            "Assign": self._src_assign,
+            "Param": self._src_param,
+            "PostfixOp": self._src_postfixop,
+            "PrefixOp": self._src_prefixop,
+            "Ternary": self._src_ternary,
+            "ArrayInit": self._src_array_init,
+            "FieldDecl": self._src_field_decl,
+        }
+
+    def indent(self) -> str:
+        # внутри транслятора читается напрямую self._cur_indent — без вызова метода
+        return self._cur_indent
+
+    def _push_indent(self) -> None:
+        self.indent_level += 1
+        cache = self._indent_cache
+        if len(cache) <= self.indent_level:
+            cache.append(cache[-1] + self.indent_str)
+        self._cur_indent = cache[self.indent_level]
+
+    def _pop_indent(self) -> None:
+        self.indent_level -= 1
+        self._cur_indent = self._indent_cache[self.indent_level]
+
+    def _format_literal_token(self, raw_value) -> str:
+        if raw_value is None:
+            return '""'
+        s = str(raw_value)
+        q = s[:1]
+        if (q == '"' or q == "'") and s.endswith(q):
+            return s
+        py = self.KEYWORD_LITERALS.get(s.lower())
+        if py is not None:
+            return py
+        # обычные числа — без исключений; прочее проверяем как раньше через int()/float()
+        if _NUMBER_RE.fullmatch(s):
+            return s
+        try:
+            int(s)
+            return s
+        except Exception:
+            try:
+                float(s)
+                return s
+            except Exception:
+                pass
+        if '"' in s or "\\" in s:
+            s = s.translate(_STR_ESCAPE_TABLE)
+        return f'"{s}"'
+
+    def translate(self, ast) -> str:
+        # все методы _trans_* дописывают готовые строки в один буфер,
+        # склейка происходит один раз в конце
+        out: List[str] = []
+        self._translate_node(ast, out)
+        return "\n".join(out)
+
+    # ---------- центральный диспетчер ----------
+
+    def _translate_node(self, node, out: List[str]) -> None:
+        """
+        Дописывает в out строки, в которые транслируется узел.
+        Пустой результат — ни одной строки (одиночная пустая строка снимается).
+        """
+        if node is None:
+            return
+        start = len(out)
+        fn = self._dispatch.get(node.type)
+        if fn is not None:
+            fn(node, out)
+        else:
+            # fallback: просто обходим детей
+            for c in node.children:
+                if c is None:
+                    continue
+                if c.__class__ is str:
+                    line = self._cur_indent + c
+                    if line:
+                        out.append(line)
+                else:
+                    self._translate_node(c, out)
+        if len(out) == start + 1 and not out[start]:
+            out.pop()
+
+    def _emit_line(self, node, out: List[str]) -> None:
+        """
+        Транслирует узел-оператор внутри тела: если узел не дал ни одной строки,
+        на его месте остаётся пустая строка.
+        """
+        # диспетчеризуем сами, а не через _translate_node: операторов в телах большинство,
+        # и лишний вызов на каждый не нужен. Снятие одиночной пустой строки там
+        # здесь всё равно вернуло бы её обратно
+        start = len(out)
+        if node is not None:
+            fn = self._dispatch.get(node.type)
+            if fn is not None:
+                fn(node, out)
             else:
-                out_lines.append(self._translate_node(c))
-        return "\n".join([l for l in out_lines if l])
+                self._translate_node(node, out)
+        if len(out) == start:
+            out.append("")
 
     # ---------- верхний уровень ----------
 
-    def _trans_compilation_unit(self, node):
-        parts = []
+    def _trans_compilation_unit(self, node, out):
+        # классы разделяются пустой строкой; пустые результаты пропускаются
+        sep = False
         for child in node.children:
-            s = self._translate_node(child)
-            if s:
-                parts.append(s)
-        return "\n\n".join(parts)
+            if sep:
+                out.append("")
+            start = len(out)
+            self._translate_node(child, out)
+            if len(out) > start:
+                sep = True
+            elif sep:
+                out.pop()
 
     # -- утилиты для классов/полей/конструкторов --
 
@@ -229,13 +337,13 @@ class Translator:
         """
         fields, ctors, others = [], [], []
         for ch in children:
-            t = getattr(ch, "type", None)
+            t = ch.type
             if t == "FieldDecl":
                 fields.append(ch)
             elif t == "Block":
                 # если это результат распаковки множественной декларации (только FieldDecl внутри) — считаем как поля
-                if all(getattr(c, "type", None) == "FieldDecl" for c in (ch.children or [])):
-                    fields.extend(ch.children or [])
+                if all(c.type == "FieldDecl" for c in ch.children):
+                    fields.extend(ch.children)
                 else:
                     others.append(ch)
             elif t == "ConstructorDecl":
@@ -244,12 +352,27 @@ class Translator:
                 others.append(ch)
         return fields, ctors, others
 
+    @staticmethod
+    def _split_params(children):
+        """
+        Делит детей метода/конструктора (уже без Modifiers) на (params, body_nodes)
+        за один проход. Дети здесь всегда ASTNode — так строит их парсер.
+        """
+        params, body_nodes = [], []
+        add_param, add_body = params.append, body_nodes.append
+        for c in children:
+            if c.type == "Param":
+                add_param(c)
+            else:
+                add_body(c)
+        return params, body_nodes
+
     def _split_static_instance_fields(self, fields):
         static_fields, instance_fields = [], []
         for f in fields:
             mods = None
-            for c in (f.children or []):
-                if getattr(c, "type", None) == "Modifiers":
+            for c in f.children:
+                if c.type == "Modifiers":
                     mods = (c.value or "")
                     break
             if mods and "STATIC" in mods:
@@ -258,6 +381,19 @@ class Translator:
                 instance_fields.append(f)
         return static_fields, instance_fields
 
+    @staticmethod
+    def _field_init_expr(field_node):
+        """
+        Выражение-инициализатор FieldDecl или None.
+        Парсер кладёт Init последним ребёнком (после Modifiers), так что обход не нужен.
+        """
+        children = field_node.children
+        if children:
+            last = children[-1]
+            if last.type == "Init" and last.children:
+                return last.children[0]
+        return None
+
     def _field_as_instance_assignment(self, field_node):
         """
         Превращает FieldDecl("T name", [Init(expr)?]) в строку "self.name: pyT = <rhs>".
@@ -268,12 +404,7 @@ class Translator:
         declared_type = " ".join(parts[:-1]) if len(parts) >= 2 else None
         py_type = map_java_type_to_py(declared_type) if declared_type else None
 
-        init_node = None
-        for c in (field_node.children or []):
-            if getattr(c, "type", None) == "Init" and c.children:
-                init_node = c.children[0]
-                break
-
+        init_node = self._field_init_expr(field_node)
         if init_node is not None:
             rhs = self._expr_to_source(init_node)
             if not rhs:
@@ -296,9 +427,9 @@ class Translator:
         Возвращает список (param_name, py_type) для конструктора.
         """
         params = []
-        for c in (ctor_node.children or []):
-            if getattr(c, "type", None) == "Param":
-                pv = c.value.strip() if getattr(c, "value", None) else ""
+        for c in ctor_node.children:
+            if c.type == "Param":
+                pv = c.value.strip() if c.value else ""
                 pp = pv.split()
                 if len(pp) >= 2:
                     p_type_java = " ".join(pp[:-1])
@@ -310,14 +441,14 @@ class Translator:
                     params.append((name, "Any"))
         return params
 
-    def _render_init_with_injection(self, header: str, body_src: str, instance_fields) -> str:
+    def _render_init_with_injection(self, header: str, lines: List[str], instance_fields) -> List[str]:
         """
         Вставляет инициализацию инстанс‑полей в тело конструктора (если они не присваиваются внутри).
+        lines — строки конструктора (заголовок и тело); возвращает итоговые строки __init__.
         """
-        lines = body_src.splitlines()
         if not lines:
             # на всякий случай
-            lines = [f"{self.indent()}def __init__(self):", self.indent() + self.indent_str + "pass"]
+            lines = [f"{self._cur_indent}def __init__(self):", self._cur_indent + self.indent_str + "pass"]
 
         # найдём отступ тела и первую содержательную строку
         body_indent = None
@@ -328,7 +459,7 @@ class Translator:
                 first_body_idx = idx
                 break
         if body_indent is None:
-            body_indent = self.indent() + self.indent_str
+            body_indent = self._cur_indent + self.indent_str
 
         # делегирующий конструктор? (первая строка self.__init__(...) или super().__init__(...))
         is_delegating = False
@@ -351,9 +482,9 @@ class Translator:
 
         # заменим заголовок на переданный (если надо его подменять при мердже)
         lines[0] = header
-        return "\n".join(lines)
+        return lines
 
-    def _merge_constructors_to_single_init(self, class_indent: str, ctors, instance_fields):
+    def _merge_constructors_to_single_init(self, class_indent: str, ctors, instance_fields) -> List[str]:
         """
         Мержим перегруженные конструкторы Java в один __init__ в Python.
         Стратегия:
@@ -363,22 +494,24 @@ class Translator:
             значения по умолчанию (default_for_type) в сигнатуре;
           - тело берём из основного + инжектим инстанс‑поля (если не присваиваются).
         """
+        # число параметров каждой перегрузки — считаем один раз
+        arities = [
+            sum(1 for x in c.children if x.type == "Param")
+            for c in ctors
+        ]
+
         # 1) основной (max params)
-        primary = max(ctors, key=lambda c: len([x for x in (c.children or []) if getattr(x, "type", None) == "Param"]))
+        primary = ctors[arities.index(max(arities))]
         primary_params = self._ctor_params_info(primary)
-        primary_header, primary_body = self._render_ctor_string(primary)
+        primary_header, primary_lines = self._render_ctor_lines(primary)
 
         # 2) сколько параметров у меньших перегрузок
-        arities = sorted({
-            len([x for x in (c.children or []) if getattr(x, "type", None) == "Param"])
-            for c in ctors
-        })
-        min_arity = arities[0] if arities else len(primary_params)
+        min_arity = min(arities) if arities else len(primary_params)
 
         # 3) подменим заголовок: добавим значения по умолчанию для "хвоста"
         def_header = self._build_init_header_from_params(primary_params, min_arity, class_indent)
         # 4) инжекция полей
-        return self._render_init_with_injection(def_header, primary_body, instance_fields)
+        return self._render_init_with_injection(def_header, primary_lines, instance_fields)
 
     def _build_init_header_from_params(self, params: List[Tuple[str, str]], min_arity: int, class_indent: str) -> str:
         """
@@ -393,23 +526,23 @@ class Translator:
                 items.append(f"{name}: {ptype} = {default}" if ptype and ptype != "None" else f"{name} = {default}")
             else:
                 items.append(f"{name}: {ptype}" if ptype and ptype != "None" else name)
-        param_list = ("self" + (", " + ", ".join(items) if items else ""))
+        param_list = "self, " + ", ".join(items) if items else "self"
         return f"{class_indent}def __init__({param_list}):"
 
-    def _render_ctor_string(self, ctor_node) -> Tuple[str, str]:
+    def _render_ctor_lines(self, ctor_node) -> Tuple[str, List[str]]:
         """
-        Возвращает (header_line, whole_string) для данного ConstructorDecl.
+        Возвращает (header_line, lines) для данного ConstructorDecl:
+        lines — заголовок и строки тела.
         """
         # повторяем логику _trans_constructor_decl, но разбиваем на (заголовок, текст)
-        children = list(ctor_node.children or [])
-        if children and getattr(children[0], "type", None) == "Modifiers":
+        children = ctor_node.children
+        if children and children[0].type == "Modifiers":
             children = children[1:]
-        params = [c for c in children if getattr(c, "type", None) == "Param"]
-        body_nodes = [c for c in children if getattr(c, "type", None) != "Param"]
+        params, body_nodes = self._split_params(children)
 
         param_parts = []
         for p in params:
-            pv = p.value.strip() if getattr(p, "value", None) else ""
+            pv = p.value.strip() if p.value else ""
             pp = pv.split()
             if len(pp) >= 2:
                 p_type_java = " ".join(pp[:-1])
@@ -419,95 +552,88 @@ class Translator:
             else:
                 param_parts.append(pp[-1] if pp else "arg")
 
-        header = f"{self.indent()}def __init__(self{', ' if param_parts else ''}{', '.join(param_parts)}):"
+        header = f"{self._cur_indent}def __init__(self{', ' if param_parts else ''}{', '.join(param_parts)}):"
 
         self._in_constructor = True
-        self.indent_level += 1
-        body_lines = []
+        self._push_indent()
+        lines = [header]
         if not body_nodes:
-            body_lines.append(self.indent() + "pass")
+            lines.append(self._cur_indent + "pass")
         else:
             for b in body_nodes:
-                rendered = self._translate_node(b)
-                if rendered:
-                    body_lines.extend(rendered.splitlines())
-        self.indent_level -= 1
+                self._translate_node(b, lines)
+        self._pop_indent()
         self._in_constructor = False
 
-        return header, f"{header}\n" + "\n".join(body_lines)
+        return header, lines
 
     # ---------- класс ----------
 
-    def _trans_class_decl(self, node):
+    def _trans_class_decl(self, node, out):
         class_name = node.value or ""
-        children = list(node.children or [])
+        children = node.children
 
         # Modifiers (не печатаем в заголовке)
-        if children and getattr(children[0], "type", None) == "Modifiers":
+        if children and children[0].type == "Modifiers":
             children = children[1:]
 
         # Base classes (узел "Base" вставляется парсером)
         bases = []
-        if children and getattr(children[0], "type", None) == "Base":
+        if children and children[0].type == "Base":
             base_val = children[0].value or ""
-            bases = [b.strip() for b in base_val.split(",") if b.strip()]
+            bases = [b for b in map(str.strip, base_val.split(",")) if b]
             children = children[1:]
 
-        header = f"class {class_name}" + (f"({', '.join(bases)})" if bases else "") + ":"
+        header = f"class {class_name}({', '.join(bases)}):" if bases else f"class {class_name}:"
 
         # классифицируем элементы
         fields, ctors, others = self._split_fields_ctors_others(children)
         static_fields, instance_fields = self._split_static_instance_fields(fields)
 
+        out.append(header)
         # пустой класс?
         if not ctors and not others and not static_fields and not instance_fields:
-            return header + "\n" + self.indent_str + "pass"
+            out.append(self.indent_str + "pass")
+            return
 
-        body_chunks: List[str] = []
-        self.indent_level += 1
-        class_indent = self.indent()
+        self._push_indent()
+        class_indent = self._cur_indent
 
         # 1) статические поля — классовые атрибуты
         for f in static_fields:
-            body_chunks.append(self._translate_node(f))
+            self._emit_line(f, out)
 
         # 2) конструкторы / синтез __init__ / мерж перегрузок
         if ctors:
             if len(ctors) == 1:
                 # обычный одиночный конструктор
-                _, ctor_text = self._render_ctor_string(ctors[0])
+                ctor_header, ctor_lines = self._render_ctor_lines(ctors[0])
                 # инжектим инстанс‑поля
-                init_text = self._render_init_with_injection(ctor_text.splitlines()[0], ctor_text, instance_fields)
-                body_chunks.append(init_text)
+                out.extend(self._render_init_with_injection(ctor_header, ctor_lines, instance_fields))
             else:
                 # объединяем перегрузки в один __init__
-                init_text = self._merge_constructors_to_single_init(class_indent, ctors, instance_fields)
-                body_chunks.append(init_text)
+                out.extend(self._merge_constructors_to_single_init(class_indent, ctors, instance_fields))
         else:
             # нет конструкторов: если есть инстанс‑поля — сгенерим __init__
             if instance_fields:
-                lines = [f"{class_indent}def __init__(self):"]
+                out.append(f"{class_indent}def __init__(self):")
                 inner_indent = class_indent + self.indent_str
                 for f in instance_fields:
-                    lines.append(inner_indent + self._field_as_instance_assignment(f))
-                body_chunks.append("\n".join(lines))
+                    out.append(inner_indent + self._field_as_instance_assignment(f))
             # иначе — __init__ не печатаем
 
         # 3) остальные члены (методы и т.п.)
         for o in others:
-            body_chunks.append(self._translate_node(o))
-
-        self.indent_level -= 1
-        return header + "\n" + "\n".join(body_chunks)
+            self._emit_line(o, out)
 
-    def _trans_modifiers(self, node):
-        # Внутри класса модификаторы печатаем только там, где это уместно (например, перед стат. методами)
-        # Отдельно как комментарий отдаём только если узел стоит сам по себе
-        return f"# modifiers: {node.value}"
+        self._pop_indent()
 
     # ---------- fields ----------
 
-    def _trans_field_decl(self, node):
+    def _trans_field_decl(self, node, out):
+        out.append(self._field_decl_line(node))
+
+    def _field_decl_line(self, node) -> str:
         """
         Печать поля ТОЛЬКО для случая статического поля (или когда узел используется как локальная переменная).
         На уровне класса нестатические поля не печатаются отдельными строками — они инициализируются в __init__.
@@ -523,46 +649,38 @@ class Translator:
         else:
             declared_type, name = None, "var"
 
-        # ищем Init
-        init_node = None
-        for c in (node.children or []):
-            if getattr(c, "type", None) == "Init" and c.children:
-                init_node = c.children[0]
-                break
-
+        init_node = self._field_init_expr(node)
         py_type = map_java_type_to_py(declared_type) if declared_type else None
         if init_node is not None:
             init_src = self._expr_to_source(init_node)
             if not init_src:
                 init_src = default_for_type(py_type) if py_type else "None"
             if py_type and py_type != "None":
-                return f"{self.indent()}{name}: {py_type} = {init_src}"
-            return f"{self.indent()}{name} = {init_src}"
+                return f"{self._cur_indent}{name}: {py_type} = {init_src}"
+            return f"{self._cur_indent}{name} = {init_src}"
 
         default = default_for_type(py_type) if py_type else "None"
         if py_type and py_type != "None":
-            return f"{self.indent()}{name}: {py_type} = {default}"
-        return f"{self.indent()}{name} = {default}"
+            return f"{self._cur_indent}{name}: {py_type} = {default}"
+        return f"{self._cur_indent}{name} = {default}"
 
-    def _trans_init_wrapper(self, node):
+    def _trans_init_wrapper(self, node, out):
         if node.children:
-            return self._expr_to_source(node.children[0])
-        return ""
+            out.append(self._expr_to_source(node.children[0]))
 
     # ---------- methods / ctors ----------
 
-    def _trans_param(self, node):
+    def _trans_param(self, node, out):
         # для сигнатур и foreach‑переменной
-        return node.value or ""
+        out.append(node.value or "")
 
-    def _trans_method_decl(self, node):
-        children = list(node.children or [])
+    def _trans_method_decl(self, node, out):
+        children = node.children
         modifiers = []
-        if children and getattr(children[0], "type", None) == "Modifiers":
+        if children and children[0].type == "Modifiers":
             modifiers = children[0].value.split(",") if children[0].value else []
             children = children[1:]
-        params = [c for c in children if getattr(c, "type", None) == "Param"]
-        body_nodes = [c for c in children if getattr(c, "type", None) != "Param"]
+        params, body_nodes = self._split_params(children)
 
         ret_type = None
         method_name = None
@@ -579,7 +697,7 @@ class Translator:
 
         param_items = []
         for p in params:
-            pv = p.value.strip() if getattr(p, "value", None) else ""
+            pv = p.value.strip() if p.value else ""
             pp = pv.split()
             if len(pp) >= 2:
                 p_type_java = " ".join(pp[:-1])
@@ -590,40 +708,35 @@ class Translator:
                 param_items.append(pp[-1] if pp else "arg")
 
         if not is_static:
-            param_list = "self" + (", " + ", ".join(param_items) if param_items else "")
+            param_list = "self, " + ", ".join(param_items) if param_items else "self"
         else:
             param_list = ", ".join(param_items)
 
         ret_py = map_java_type_to_py(ret_type) if ret_type is not None else "None"
         header = f"def {method_name}({param_list}) -> {ret_py}:"
 
-        result = []
         if is_static:
-            result.append(f"{self.indent()}@staticmethod")
-        result.append(f"{self.indent()}{header}")
+            out.append(f"{self._cur_indent}@staticmethod")
+        out.append(f"{self._cur_indent}{header}")
 
-        self.indent_level += 1
+        self._push_indent()
         if not body_nodes:
-            result.append(self.indent() + "pass")
+            out.append(self._cur_indent + "pass")
         else:
             for b in body_nodes:
-                rendered = self._translate_node(b)
-                if rendered:
-                    result.append(rendered)
-        self.indent_level -= 1
-        return "\n".join(result)
+                self._translate_node(b, out)
+        self._pop_indent()
 
-    def _trans_constructor_decl(self, node):
+    def _trans_constructor_decl(self, node, out):
         # Обычно используется только для одиночного конструктора; при перегрузке — мержим отдельно
-        children = list(node.children or [])
-        if children and getattr(children[0], "type", None) == "Modifiers":
+        children = node.children
+        if children and children[0].type == "Modifiers":
             children = children[1:]
-        params = [c for c in children if getattr(c, "type", None) == "Param"]
-        body_nodes = [c for c in children if getattr(c, "type", None) != "Param"]
+        params, body_nodes = self._split_params(children)
 
         param_parts = []
         for p in params:
-            pv = p.value.strip() if getattr(p, "value", None) else ""
+            pv = p.value.strip() if p.value else ""
             pp = pv.split()
             if len(pp) >= 2:
                 p_type_java = " ".join(pp[:-1])
@@ -634,78 +747,69 @@ class Translator:
                 param_parts.append(pp[-1] if pp else "arg")
 
         header = f"def __init__(self{', ' if param_parts else ''}{', '.join(param_parts)}):"
+        out.append(f"{self._cur_indent}{header}")
 
         self._in_constructor = True
-        self.indent_level += 1
-        body_lines = []
+        self._push_indent()
         if not body_nodes:
-            body_lines.append(self.indent() + "pass")
+            out.append(self._cur_indent + "pass")
         else:
             for b in body_nodes:
-                rendered = self._translate_node(b)
-                if rendered:
-                    body_lines.extend(rendered.splitlines())
-        self.indent_level -= 1
+                self._translate_node(b, out)
+        self._pop_indent()
         self._in_constructor = False
 
-        return f"{self.indent()}{header}\n" + "\n".join(body_lines)
-
     # ---------- blocks / statements ----------
 
-    def _trans_block(self, node):
+    def _trans_block(self, node, out):
         if not node.children:
-            return self.indent() + "pass"
-        lines = []
+            out.append(self._cur_indent + "pass")
+            return
+        # операторы сами печатают строки с текущим отступом
         for stmt in node.children:
-            rendered = self._translate_node(stmt)
-            if rendered:
-                for line in rendered.splitlines():
-                    if line.startswith(self.indent()):
-                        lines.append(line)
-                    else:
-                        lines.append(self.indent() + line)
-        return "\n".join(lines)
-
-    def _trans_if_statement(self, node):
-        cond_src = self._expr_to_source(node.value)
-        lines = [f"{self.indent()}if {cond_src}:"]
-        then_node = node.children[0] if node.children else None
-        self.indent_level += 1
-        if then_node:
-            for stmt in then_node.children:
-                lines.append(self._translate_node(stmt))
-        self.indent_level -= 1
-        next_else = node.children[1] if len(node.children) > 1 else None
-        while next_else:
+            self._translate_node(stmt, out)
+
+    def _trans_if_statement(self, node, out):
+        # цепочка if / else if ... / else: заголовки печатаются с внешним отступом,
+        # тела всех веток — на одном уровне глубже, без подъёма/спуска на каждую ветку
+        ind = self._cur_indent
+        emit_line = self._emit_line
+        self._push_indent()
+        keyword = "if"
+        while True:
+            out.append(f"{ind}{keyword} {self._expr_to_source(node.value)}:")
+            children = node.children
+            if children:
+                for stmt in children[0].children:
+                    emit_line(stmt, out)
+            next_else = children[1] if len(children) > 1 else None
+            if next_else is None:
+                break
             if next_else.type == "IfStatement":
-                elif_cond = self._expr_to_source(next_else.value)
-                lines.append(f"{self.indent()}elif {elif_cond}:")
-                self.indent_level += 1
-                then_of_else = next_else.children[0] if next_else.children else None
-                if then_of_else:
-                    for stmt in then_of_else.children:
-                        lines.append(self._translate_node(stmt))
-                self.indent_level -= 1
-                next_else = next_else.children[1] if len(next_else.children) > 1 else None
-            elif next_else.type == "Else":
-                lines.append(f"{self.indent()}else:")
-                self.indent_level += 1
+                node = next_else
+                keyword = "elif"
+                continue
+            if next_else.type == "Else":
+                out.append(f"{ind}else:")
                 for stmt in next_else.children:
-                    lines.append(self._translate_node(stmt))
-                self.indent_level -= 1
-                next_else = None
-            else:
-                lines.append(self._translate_node(next_else))
-                next_else = None
-        return "\n".join(lines)
+                    emit_line(stmt, out)
+                break
+            self._pop_indent()
+            emit_line(next_else, out)
+            return
+        self._pop_indent()
 
-    def _trans_then(self, node):
-        return "\n".join(self._translate_node(c) for c in node.children if c)
+    def _trans_then(self, node, out):
+        for c in node.children:
+            if c:
+                self._emit_line(c, out)
 
-    def _trans_else(self, node):
-        return "\n".join(self._translate_node(c) for c in node.children if c)
+    def _trans_else(self, node, out):
+        for c in node.children:
+            if c:
+                self._emit_line(c, out)
 
-    def _trans_try_statement(self, node):
+    def _trans_try_statement(self, node, out):
         """
         Children layout:
           [ TryBlock, Catch*, (optional) Finally ]
@@ -713,21 +817,20 @@ class Translator:
         Catch    = ASTNode("Catch", "Type name", [stmts...])
         Finally  = ASTNode("Finally", None, [stmts...])
         """
-        lines = []
         # try
-        lines.append(f"{self.indent()}try:")
-        self.indent_level += 1
+        out.append(f"{self._cur_indent}try:")
+        self._push_indent()
         try_block = node.children[0] if node.children else None
         if try_block:
             for stmt in try_block.children:
-                lines.append(self._translate_node(stmt))
+                self._emit_line(stmt, out)
         else:
-            lines.append(self.indent() + "pass")
-        self.indent_level -= 1
+            out.append(self._cur_indent + "pass")
+        self._pop_indent()
 
         # catches
         for ch in node.children[1:]:
-            t = getattr(ch, "type", None)
+            t = ch.type
             if t != "Catch":
                 continue
             type_name, var_name = None, None
@@ -739,420 +842,383 @@ class Translator:
                     type_name = parts[0]
                     var_name = parts[1]
             type_name = type_name or "Exception"
-            header = f"{self.indent()}except {type_name}"
+            header = f"{self._cur_indent}except {type_name}"
             if var_name:
                 header += f" as {var_name}"
             header += ":"
-            lines.append(header)
-            self.indent_level += 1
+            out.append(header)
+            self._push_indent()
             if ch.children:
                 for stmt in ch.children:
-                    lines.append(self._translate_node(stmt))
+                    self._emit_line(stmt, out)
             else:
-                lines.append(self.indent() + "pass")
-            self.indent_level -= 1
+                out.append(self._cur_indent + "pass")
+            self._pop_indent()
 
         # finally (если есть)
         last = node.children[-1] if node.children else None
-        if last and getattr(last, "type", None) == "Finally":
-            lines.append(f"{self.indent()}finally:")
-            self.indent_level += 1
+        if last and last.type == "Finally":
+            out.append(f"{self._cur_indent}finally:")
+            self._push_indent()
             if last.children:
                 for stmt in last.children:
-                    lines.append(self._translate_node(stmt))
+                    self._emit_line(stmt, out)
             else:
-                lines.append(self.indent() + "pass")
-            self.indent_level -= 1
+                out.append(self._cur_indent + "pass")
+            self._pop_indent()
 
-        return "\n".join(lines)
-
-    def _trans_return(self, node):
+    def _trans_return(self, node, out):
         if node.children:
-            return f"{self.indent()}return {self._expr_to_source(node.children[0])}"
-        return f"{self.indent()}return"
+            out.append(f"{self._cur_indent}return {self._expr_to_source(node.children[0])}")
+        else:
+            out.append(f"{self._cur_indent}return")
 
-    def _trans_break(self, node):
-        return f"{self.indent()}break"
+    def _trans_break(self, node, out):
+        out.append(f"{self._cur_indent}break")
 
-    def _trans_continue(self, node):
-        return f"{self.indent()}continue"
+    def _trans_continue(self, node, out):
+        out.append(f"{self._cur_indent}continue")
 
-    def _trans_expr_stmt(self, node):
+    def _trans_expr_stmt(self, node, out):
         if node.children:
             expr = node.children[0]
-            expr_src = self._expr_to_source(expr)
-            return "\n".join((self.indent() + line) for line in expr_src.splitlines())
-        return f"{self.indent()}pass"
+            self._emit_source(self._expr_to_source(expr), out)
+        else:
+            out.append(f"{self._cur_indent}pass")
 
-    def _trans_call(self, node):
-        src = self._expr_to_source(node)
-        return "\n".join(self.indent() + line for line in src.splitlines())
+    def _trans_call(self, node, out):
+        self._emit_source(self._expr_to_source(node), out)
 
-    def _trans_member(self, node):
+    def _trans_member(self, node, out):
         member_name = node.value
         base = node.children[0] if node.children else None
         base_src = self._expr_to_source(base)
-        return f"{base_src}.{member_name}"
+        out.append(f"{base_src}.{member_name}")
 
-    def _trans_identifier(self, node):
-        return node.value or ""
+    def _trans_identifier(self, node, out):
+        out.append(node.value or "")
 
-    def _trans_literal(self, node):
-        return self._format_literal_token(node.value)
+    def _trans_literal(self, node, out):
+        out.append(self._format_literal_token(node.value))
 
-    def _trans_binaryop(self, node):
-        return self._expr_to_source(node)
+    def _trans_binaryop(self, node, out):
+        out.append(self._expr_to_source(node))
 
-    def _trans_unknown(self, node):
+    def _trans_unknown(self, node, out):
         text = node.value if node.value is not None else ""
-        return f"{self.indent()}# Unknown node: {text}"
+        out.append(f"{self._cur_indent}# Unknown node: {text}")
 
     # ---------- assign helpers / for ----------
 
-    def _trans_assign(self, node):
+    def _trans_assign(self, node, out):
         if not node.children or len(node.children) < 2:
-            return f"{self.indent()}# malformed assign"
+            out.append(f"{self._cur_indent}# malformed assign")
+            return
         left = node.children[0]
         right = node.children[1]
 
         left_src_raw = self._expr_to_source(left)
-        left_src = f"self.{left_src_raw}" if (self._in_constructor and getattr(left, "type", None) == "Identifier") else left_src_raw
+        left_src = f"self.{left_src_raw}" if (self._in_constructor and left.type == "Identifier") else left_src_raw
 
         # распознаём: x = x <op> y -> x <op>= y
-        if getattr(right, "type", None) == "BinaryOp" and len(getattr(right, "children", []) or []) == 2:
+        if right.type == "BinaryOp" and len(right.children) == 2:
             op = right.value
             r_left, r_right = right.children
-            if getattr(r_left, "type", None) == getattr(left, "type", None) == "Identifier" and r_left.value == getattr(left, "value", None):
-                op_map = {"ADD": "+=", "SUB": "-=", "MUL": "*=", "DIV": "/=", "MOD": "%=", "BITAND": "&=", "BITOR": "|=", "CARET": "^=", "LSHIFT": "<<=", "RSHIFT": ">>="}
+            if r_left.type == left.type == "Identifier" and r_left.value == left.value:
+                op_map = self.AUGMENTED_OP_MAP
                 if op in op_map:
-                    return f"{self.indent()}{left_src} {op_map[op]} {self._expr_to_source(r_right)}"
+                    out.append(f"{self._cur_indent}{left_src} {op_map[op]} {self._expr_to_source(r_right)}")
+                    return
 
         right_src = self._expr_to_source(right)
-        return f"{self.indent()}{left_src} = {right_src}"
+        out.append(f"{self._cur_indent}{left_src} = {right_src}")
 
     # --- for helpers ---
+    # Хелперы только разбирают структуру и возвращают узлы: исходник границ
+    # строится, лишь когда точно печатается range(...), иначе — один раз в ветке while.
 
     def _get_for_init_info(self, init_node):
+        """(имя счётчика, узел начального значения) или (None, None)."""
         if init_node is None:
             return None, None
-        if getattr(init_node, "type", None) == "FieldDecl":
+        if init_node.type == "FieldDecl":
             parts = (init_node.value or "").split()
             var_name = parts[-1] if parts else None
-            init_child = None
-            for c in init_node.children:
-                if c and getattr(c, "type", None) == "Init":
-                    init_child = c.children[0] if c.children else None
-                    break
-            if init_child:
-                return var_name, self._expr_to_source(init_child)
-            return var_name, None
-        if getattr(init_node, "type", None) == "Assign":
+            return var_name, self._field_init_expr(init_node)
+        if init_node.type == "Assign":
             left = init_node.children[0] if init_node.children else None
             right = init_node.children[1] if init_node.children else None
-            if left and getattr(left, "type", None) == "Identifier":
-                return left.value, self._expr_to_source(right)
+            if left is not None and left.type == "Identifier":
+                return left.value, right
         return None, None
 
-    def _get_for_update_step(self, update_node, var_name):
+    @staticmethod
+    def _get_for_update_step(update_node):
+        """Целый шаг счётчика или None, если обновление не сводится к константе."""
         if update_node is None:
             return None
-        if getattr(update_node, "type", None) in ("PostfixOp", "PrefixOp"):
+        t = update_node.type
+        if t == "PostfixOp" or t == "PrefixOp":
             if update_node.value == "INC":
                 return 1
             if update_node.value == "DEC":
                 return -1
-        if getattr(update_node, "type", None) == "BinaryOp":
-            return self._expr_to_source(update_node)
-        if getattr(update_node, "type", None) == "Assign":
+            return None
+        if t == "Assign":
             right = update_node.children[1] if update_node.children else None
-            if getattr(right, "type", None) == "BinaryOp":
+            if right is not None and right.type == "BinaryOp":
                 op = right.value
-                if op == "ADD":
-                    try:
-                        return int(right.children[1].value)
-                    except Exception:
-                        return self._expr_to_source(update_node)
-                if op == "SUB":
+                if op == "ADD" or op == "SUB":
                     try:
-                        return -int(right.children[1].value)
+                        step = int(right.children[1].value)
                     except Exception:
-                        return self._expr_to_source(update_node)
-            return self._expr_to_source(update_node)
-        return self._expr_to_source(update_node)
+                        return None
+                    return step if op == "ADD" else -step
+        return None
 
-    def _get_for_condition_end(self, cond_node, var_name):
+    @staticmethod
+    def _get_for_condition_end(cond_node, var_name):
+        """(узел границы, оператор сравнения) для `var <op> end` или (None, None)."""
         if cond_node is None:
             return None, None
-        if getattr(cond_node, "type", None) == "BinaryOp":
+        if cond_node.type == "BinaryOp":
             left = cond_node.children[0]
-            right = cond_node.children[1]
-            op = cond_node.value
-            left_name = left.value if getattr(left, "type", None) == "Identifier" else None
+            left_name = left.value if left.type == "Identifier" else None
             if var_name is None or left_name == var_name:
-                return self._expr_to_source(right), op
+                return cond_node.children[1], cond_node.value
         return None, None
 
-    def _trans_for_statement(self, node):
-        children = node.children or []
+    def _trans_for_statement(self, node, out):
+        children = node.children
         # классический for(init; cond; update)
         if len(children) == 4:
             init, condition, update, body = children
-            var_name, start_src = self._get_for_init_info(init)
-            end_src, cond_op = self._get_for_condition_end(condition, var_name)
-            step = self._get_for_update_step(update, var_name)
-            if var_name and end_src is not None:
-                if cond_op == "LE":
-                    end_expr = f"({end_src}) + 1"
-                elif cond_op == "LT":
-                    end_expr = end_src
-                else:
-                    end_expr = None
-                if end_expr is not None:
-                    if start_src is None:
-                        start_src = "0"
-                    if isinstance(step, int):
+            var_name, start_node = self._get_for_init_info(init)
+            if var_name:
+                end_node, cond_op = self._get_for_condition_end(condition, var_name)
+                if end_node is not None and (cond_op == "LT" or cond_op == "LE"):
+                    step = self._get_for_update_step(update)
+                    if step is not None:
+                        end_src = self._expr_to_source(end_node)
+                        end_expr = f"({end_src}) + 1" if cond_op == "LE" else end_src
+                        start_src = "0" if start_node is None else self._expr_to_source(start_node)
                         step_part = "" if step == 1 else f", {step}"
-                        return f"{self.indent()}for {var_name} in range({start_src}, {end_expr}{step_part}):\n" + self._block_inside_as_lines(body)
+                        out.append(f"{self._cur_indent}for {var_name} in range({start_src}, {end_expr}{step_part}):")
+                        self._emit_block_inside(body, out)
+                        return
             # fallback: for -> while
-            lines = []
             if init is not None:
-                if getattr(init, "type", None) == "FieldDecl":
-                    lines.append(self._trans_field_decl(init))
+                if init.type == "FieldDecl":
+                    out.append(self._field_decl_line(init))
                 else:
-                    init_src = self._expr_to_source(init)
-                    if init_src:
-                        for ln in init_src.splitlines():
-                            lines.append(self.indent() + ln)
+                    self._emit_source(self._expr_to_source(init), out)
             cond_src = self._expr_to_source(condition) if condition is not None else "True"
-            lines.append(self.indent() + f"while {cond_src}:")
-            self.indent_level += 1
-            lines.append(self._translate_node(body))
+            out.append(f"{self._cur_indent}while {cond_src}:")
+            self._push_indent()
+            self._emit_line(body, out)
             if update is not None:
-                update_src = self._expr_to_source(update)
-                if update_src:
-                    for ln in update_src.splitlines():
-                        lines.append(self.indent() + ln)
-            self.indent_level -= 1
-            return "\n".join(lines)
+                self._emit_source(self._expr_to_source(update), out)
+            self._pop_indent()
+            return
 
         # foreach (var : collection)
         if len(children) == 3:
             var_node, collection_expr, body = children
             var_name = self._expr_to_source(var_node)
             coll_src = self._expr_to_source(collection_expr)
-            lines = [self.indent() + f"for {var_name} in {coll_src}:"]
-            self.indent_level += 1
-            lines.append(self._translate_node(body))
-            self.indent_level -= 1
-            return "\n".join(lines)
+            out.append(f"{self._cur_indent}for {var_name} in {coll_src}:")
+            self._emit_block_inside(body, out)
+            return
 
-        return f"{self.indent()}# Unsupported for-statement"
+        out.append(f"{self._cur_indent}# Unsupported for-statement")
 
-    def _block_inside_as_lines(self, body):
-        self.indent_level += 1
-        block_src = self._translate_node(body)
-        self.indent_level -= 1
-        return block_src
+    def _emit_source(self, src: str, out: List[str]) -> None:
+        """
+        Дописывает исходник выражения с текущим отступом.
+        Обычно это одна строка; построчно режем только то, где есть перевод строки
+        (строковый литерал может быть многострочным). Все разделители splitlines
+        непечатаемые, поэтому isprintable() — быстрая проверка «одна строка».
+        """
+        if src.isprintable():
+            if src:
+                out.append(self._cur_indent + src)
+        else:
+            ind = self._cur_indent
+            out.extend(ind + line for line in src.splitlines())
 
-    def _trans_while_statement(self, node):
+    def _emit_block_inside(self, body, out):
+        self._push_indent()
+        self._emit_line(body, out)
+        self._pop_indent()
+
+    def _trans_while_statement(self, node, out):
         condition, body = node.children
         cond_src = self._expr_to_source(condition)
-        lines = [self.indent() + f"while {cond_src}:"]
-        self.indent_level += 1
-        lines.append(self._translate_node(body))
-        self.indent_level -= 1
-        return "\n".join(lines)
+        out.append(f"{self._cur_indent}while {cond_src}:")
+        self._emit_block_inside(body, out)
 
-    def _trans_do_while_statement(self, node):
+    def _trans_do_while_statement(self, node, out):
         condition, body = node.children
         cond_src = self._expr_to_source(condition)
-        lines = [self.indent() + "while True:"]
-        self.indent_level += 1
-        lines.append(self._translate_node(body))
-        lines.append(self.indent() + f"if not ({cond_src}):")
-        self.indent_level += 1
-        lines.append(self.indent() + "break")
-        self.indent_level -= 2
-        return "\n".join(lines)
-
-    def _trans_switch_statement(self, node):
+        out.append(self._cur_indent + "while True:")
+        self._push_indent()
+        self._emit_line(body, out)
+        out.append(f"{self._cur_indent}if not ({cond_src}):")
+        self._push_indent()
+        out.append(self._cur_indent + "break")
+        self._pop_indent()
+        self._pop_indent()
+
+    def _trans_switch_statement(self, node, out):
         if not node.children:
-            return f"{self.indent()}# empty switch"
+            out.append(f"{self._cur_indent}# empty switch")
+            return
         expr = node.children[0]
         cases = node.children[1:]
-        lines = [self.indent() + f"match {self._expr_to_source(expr)}:"]
-        self.indent_level += 1
+        out.append(f"{self._cur_indent}match {self._expr_to_source(expr)}:")
+        self._push_indent()
         for case in cases:
-            case_src = self._translate_node(case)
-            lines.extend(case_src.splitlines())
-        self.indent_level -= 1
-        return "\n".join(lines)
+            self._translate_node(case, out)
+        self._pop_indent()
 
-    def _trans_case_label(self, node):
+    def _trans_case_label(self, node, out):
         if not node.children:
-            return self.indent() + "# empty case"
+            out.append(self._cur_indent + "# empty case")
+            return
         case_val = node.children[0]
         stmts = node.children[1:]
-        lines = []
-        lines.append(self.indent() + f"case {self._expr_to_source(case_val)}:")
-        self.indent_level += 1
+        out.append(f"{self._cur_indent}case {self._expr_to_source(case_val)}:")
+        self._push_indent()
         for s in stmts:
             # в match/case break не нужен — вырезаем
-            if getattr(s, "type", None) == "Break":
+            if s.type == "Break":
                 continue
-            out = self._translate_node(s)
-            if out:
-                lines.append(out)
-        self.indent_level -= 1
-        return "\n".join(lines)
+            self._translate_node(s, out)
+        self._pop_indent()
 
-    def _trans_default_label(self, node):
-        lines = []
-        lines.append(self.indent() + "case _:")
-        self.indent_level += 1
+    def _trans_default_label(self, node, out):
+        out.append(self._cur_indent + "case _:")
+        self._push_indent()
         for s in node.children:
-            if getattr(s, "type", None) == "Break":
+            if s.type == "Break":
                 continue
-            out = self._translate_node(s)
-            if out:
-                lines.append(out)
-        self.indent_level -= 1
-        return "\n".join(lines)
-
-    def _trans_postfixop(self, node):
-        base_src = self._expr_to_source(node.children[0])
-        if node.value == "INC":
-            return f"{self.indent()}{base_src} += 1"
-        if node.value == "DEC":
-            return f"{self.indent()}{base_src} -= 1"
-        return f"{self.indent()}{base_src}"
-
-    def _trans_prefixop(self, node):
-        base_src = self._expr_to_source(node.children[0])
-        v = node.value
-        return {
-            "INC": f"{self.indent()}{base_src} += 1",
-            "DEC": f"{self.indent()}{base_src} -= 1",
-            "BANG": f"{self.indent()}not {base_src}",
-            "TILDE": f"{self.indent()}~({base_src})",
-            "ADD": f"{self.indent()}+({base_src})",
-            "SUB": f"{self.indent()}-({base_src})",
-        }.get(v, f"{self.indent()}{base_src}")
+            self._translate_node(s, out)
+        self._pop_indent()
+
+    def _trans_postfixop(self, node, out):
+        out.append(self._cur_indent + self._src_postfixop(node))
+
+    def _trans_prefixop(self, node, out):
+        out.append(self._cur_indent + self._src_prefixop(node))
 
     # ---------------- expr -> source ----------------
 
     def _expr_to_source(self, expr) -> str:
         if expr is None:
             return ""
-        if isinstance(expr, str):
-            return expr
-        t = getattr(expr, "type", None)
-        if t == "Literal":
-            v = expr.value or ""
-            return self._format_literal_token(v)
+        # в слотах выражений парсер хранит только ASTNode; сырые строки встречаются
+        # лишь среди детей неизвестных узлов и разбираются в обходе ниже
+        t = expr.type
+        # листья — самый частый случай, обходимся без лишнего вызова метода
         if t == "Identifier":
-            v = (expr.value or "")
+            v = expr.value or ""
             if v == "this":
                 return "self"
-            if v == "super":
-                return "super"
-            lv = v.lower()
-            if lv == "true":
-                return "True"
-            if lv == "false":
-                return "False"
-            if lv == "null":
-                return "None"
-            return v
-        if t == "Paren":
-            inner = expr.children[0] if expr.children else None
-            return f"({self._expr_to_source(inner)})"
-        if t == "Member":
-            base = expr.children[0] if expr.children else None
-            base_src = self._expr_to_source(base)
-            return f"{base_src}.{expr.value}"
-        if t == "Call":
-            base = expr.value
-            base_src = self._expr_to_source(base) if base is not None else ""
-            args = expr.children or []
-            args_src = ", ".join(self._expr_to_source(a) for a in args)
-
-            # System.out.print(ln)
-            if base_src.endswith(".println") or base_src == "System.out.println":
-                first = args[0] if args else None
-                return f"print({self._expr_to_source(first) if first else ''})"
-            if base_src.endswith(".print") or base_src == "System.out.print":
-                first = args[0] if args else None
-                return f"print({self._expr_to_source(first) if first else ''}, end='')"
-
-            # делегирование/вызов базового конструктора
-            if base_src == "self":   # this(...)
-                return f"self.__init__({args_src})"
-            if base_src == "super":  # super(...)
-                return f"super().__init__({args_src})"
-
-            # List.of(...)
-            if base_src == "List.of":
-                return "[" + ", ".join(self._expr_to_source(a) for a in args) + "]"
-
-            return f"{base_src}({args_src})"
-        if t == "BinaryOp":
-            op_map = {
-                "GT": ">", "LT": "<", "GE": ">=", "LE": "<=",
-                "EQUAL": "==", "NOTEQUAL": "!=",
-                "ADD": "+", "SUB": "-", "MUL": "*", "DIV": "/", "MOD": "%",
-                "AND": "and", "OR": "or",
-                "BITAND": "&", "BITOR": "|", "CARET": "^",
-                "LSHIFT": "<<", "RSHIFT": ">>", "URSHIFT": ">>",
-            }
-            op = op_map.get(expr.value, expr.value)
-            left = expr.children[0]
-            right = expr.children[1]
-            left_s = self._expr_to_source(left)
-            right_s = self._expr_to_source(right)
-            return f"{left_s} {op} {right_s}"
-        if t == "Assign":
-            left = expr.children[0]
-            right = expr.children[1]
-            left_s = self._expr_to_source(left)
-            right_s = self._expr_to_source(right)
-            if self._in_constructor and getattr(left, "type", None) == "Identifier":
-                left_s = f"self.{left_s}"
-            return f"{left_s} = {right_s}"
-        if t == "Param":
-            return (expr.value or "").split()[-1]
-        if t == "PostfixOp":
-            base_src = self._expr_to_source(expr.children[0])
-            if expr.value == "INC":
-                return f"{base_src} += 1"
-            if expr.value == "DEC":
-                return f"{base_src} -= 1"
-            return base_src
-        if t == "PrefixOp":
-            base_src = self._expr_to_source(expr.children[0])
-            v = expr.value
-            return {
-                "INC": f"{base_src} += 1",
-                "DEC": f"{base_src} -= 1",
-                "BANG": f"not {base_src}",
-                "TILDE": f"~({base_src})",
-                "ADD": f"+({base_src})",
-                "SUB": f"-({base_src})",
-            }.get(v, base_src)
-        if t == "Ternary":
-            cond = expr.children[0]
-            texpr = expr.children[1]
-            fexpr = expr.children[2]
-            return f"{self._expr_to_source(texpr)} if {self._expr_to_source(cond)} else {self._expr_to_source(fexpr)}"
-        if t == "ArrayInit":
-            elems = expr.children or []
-            return "[" + ", ".join(self._expr_to_source(e) for e in elems) + "]"
-        if t == "FieldDecl":
-            s = self._trans_field_decl(expr)
-            return s.strip()
-        if getattr(expr, "children", None):
+            return self.KEYWORD_LITERALS.get(v.lower(), v)
+        if t == "Literal":
+            return self._format_literal_token(expr.value or "")
+        fn = self._expr_dispatch.get(t)
+        if fn is not None:
+            return fn(expr)
+        if expr.children:
             parts = []
             for c in expr.children:
-                parts.append(self._expr_to_source(c))
-            return " ".join(p for p in parts if p)
+                parts.append(c if c.__class__ is str else self._expr_to_source(c))
+            return " ".join([p for p in parts if p])
         return ""
+
+    def _src_paren(self, expr) -> str:
+        inner = expr.children[0] if expr.children else None
+        return f"({self._expr_to_source(inner)})"
+
+    def _src_member(self, expr) -> str:
+        base = expr.children[0] if expr.children else None
+        base_src = self._expr_to_source(base)
+        return f"{base_src}.{expr.value}"
+
+    def _src_call(self, expr) -> str:
+        base = expr.value
+        args = expr.children
+
+        # System.out.print(ln): `.println`/`.print` в конце источника даёт только узел Member,
+        # поэтому смотрим на имя члена, не собирая строку базы
+        if base is not None and base.type == "Member":
+            member_name = base.value
+            if member_name == "println":
+                return f"print({self._expr_to_source(args[0]) if args else ''})"
+            if member_name == "print":
+                return f"print({self._expr_to_source(args[0]) if args else ''}, end='')"
+
+        base_src = self._expr_to_source(base) if base is not None else ""
+        args_src = ", ".join([self._expr_to_source(a) for a in args])
+
+        # делегирование/вызов базового конструктора
+        if base_src == "self":   # this(...)
+            return f"self.__init__({args_src})"
+        if base_src == "super":  # super(...)
+            return f"super().__init__({args_src})"
+
+        # List.of(...)
+        if base_src == "List.of":
+            return f"[{', '.join([self._expr_to_source(a) for a in args])}]"
+
+        return f"{base_src}({args_src})"
+
+    def _src_binaryop(self, expr) -> str:
+        op_map = self.BINARY_OP_MAP
+        # цепочка `a + b + c ...` — левоассоциативное дерево глубиной в число операндов;
+        # спускаемся по левому краю циклом, чтобы длинные выражения не упирались
+        # в предел рекурсии
+        spine = []
+        while expr.type == "BinaryOp":
+            spine.append(expr)
+            expr = expr.children[0]
+        src = self._expr_to_source(expr)
+        for node in reversed(spine):
+            op = op_map.get(node.value, node.value)
+            src = f"{src} {op} {self._expr_to_source(node.children[1])}"
+        return src
+
+    def _src_assign(self, expr) -> str:
+        left = expr.children[0]
+        right = expr.children[1]
+        left_s = self._expr_to_source(left)
+        right_s = self._expr_to_source(right)
+        if self._in_constructor and left.type == "Identifier":
+            left_s = f"self.{left_s}"
+        return f"{left_s} = {right_s}"
+
+    def _src_param(self, expr) -> str:
+        return (expr.value or "").split()[-1]
+
+    def _src_postfixop(self, expr) -> str:
+        return self._expr_to_source(expr.children[0]) + self.POSTFIX_OP_SUFFIXES.get(expr.value, "")
+
+    def _src_prefixop(self, expr) -> str:
+        base_src = self._expr_to_source(expr.children[0])
+        fmt = self.PREFIX_OP_FORMATS.get(expr.value)
+        return base_src if fmt is None else fmt.format(base_src)
+
+    def _src_ternary(self, expr) -> str:
+        cond = expr.children[0]
+        texpr = expr.children[1]
+        fexpr = expr.children[2]
+        return f"{self._expr_to_source(texpr)} if {self._expr_to_source(cond)} else {self._expr_to_source(fexpr)}"
+
+    def _src_array_init(self, expr) -> str:
+        elems = expr.children
+        return f"[{', '.join([self._expr_to_source(e) for e in elems])}]"
+
+    def _src_field_decl(self, expr) -> str:
+        s = self._field_decl_line(expr)
+        return s.strip()